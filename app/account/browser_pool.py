@@ -0,0 +1,243 @@
+"""
+Browser Pool - Long-lived Playwright Chromium Instances
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional
+from loguru import logger
+
+from app.config import settings
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+
+# Chromium launch flags that trim startup work without changing what the
+# user sees (safe for visible browsers too)
+CHROMIUM_COMMON_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--no-first-run",
+    "--disable-features=TranslateUI",
+]
+
+# Chromium launch flags for pooled (headless) browsers
+CHROMIUM_ARGS = CHROMIUM_COMMON_ARGS + [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--mute-audio",
+]
+
+
+@dataclass
+class BrowserInstance:
+    """A pooled browser with lifecycle bookkeeping."""
+    browser: Any
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    in_use: bool = False
+
+
+class BrowserPool:
+    """
+    Pool of warm Chromium instances.
+    
+    Each checkout gets a fresh BrowserContext on a pooled browser, so
+    callers stay isolated while the browser launch cost is paid once.
+    Browsers are recycled after too many uses, when too old, or when
+    they have crashed. Playwright is bound to the loop that started it;
+    if the loop changes, the previous driver is stopped on its own loop.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 2,
+        max_pages_per_browser: int = 100,
+        max_age_seconds: int = 3600
+    ):
+        self.max_size = max_size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_age_seconds = max_age_seconds
+        
+        self._playwright = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._instances: List[BrowserInstance] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._start_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _ensure_started(self) -> None:
+        """Start Playwright on the running loop (restart if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._playwright is not None:
+            return
+        
+        if async_playwright is None:
+            raise ImportError("Playwright not installed")
+        
+        # Created without awaiting, so callers on one loop share one lock
+        if self._start_loop is not loop:
+            self._start_lock = asyncio.Lock()
+            self._start_loop = loop
+        
+        async with self._start_lock:
+            if self._loop is loop and self._playwright is not None:
+                return
+            
+            # Playwright objects are bound to the loop that created them;
+            # anything left over from a previous loop is unusable here.
+            self._discard()
+            self._semaphore = asyncio.Semaphore(self.max_size)
+            self._lock = asyncio.Lock()
+            self._playwright = await async_playwright().start()
+            self._loop = loop
+            logger.info(f"Browser pool started (max_size={self.max_size})")
+    
+    def _discard(self) -> None:
+        """Detach the current driver and stop it on the loop that owns it."""
+        playwright, loop = self._playwright, self._loop
+        browsers = [instance.browser for instance in self._instances]
+        self._playwright = None
+        self._loop = None
+        self._instances = []
+        if playwright is None:
+            return
+        
+        if not loop.is_running():
+            logger.warning("Browser pool's event loop stopped before close(); dropping its Playwright driver")
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(playwright, browsers), loop)
+    
+    @staticmethod
+    async def _shutdown(playwright: Any, browsers: List[Any]) -> None:
+        """Close browsers and stop a detached Playwright driver."""
+        for browser in browsers:
+            try:
+                if browser.is_connected():
+                    await browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing pooled browser: {e}")
+        try:
+            await playwright.stop()
+        except Exception as e:
+            logger.debug(f"Error stopping Playwright: {e}")
+    
+    def _is_expired(self, instance: BrowserInstance) -> bool:
+        """Check whether a browser should be retired."""
+        if not instance.browser.is_connected():
+            return True
+        if instance.uses >= self.max_pages_per_browser:
+            return True
+        return time.monotonic() - instance.created_at >= self.max_age_seconds
+    
+    async def _retire(self, instance: BrowserInstance) -> None:
+        """Remove a browser from the pool and close it."""
+        if instance in self._instances:
+            self._instances.remove(instance)
+        try:
+            if instance.browser.is_connected():
+                await instance.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser: {e}")
+    
+    async def _acquire(self) -> BrowserInstance:
+        """Check out an idle browser, launching a new one if needed."""
+        await self._ensure_started()
+        await self._semaphore.acquire()
+        
+        try:
+            async with self._lock:
+                for instance in list(self._instances):
+                    if instance.in_use:
+                        continue
+                    if self._is_expired(instance):
+                        await self._retire(instance)
+                        continue
+                    instance.in_use = True
+                    instance.uses += 1
+                    return instance
+                
+                browser = await self._playwright.chromium.launch(
+                    headless=settings.HEADLESS,
+                    args=CHROMIUM_ARGS
+                )
+                instance = BrowserInstance(browser=browser, uses=1, in_use=True)
+                self._instances.append(instance)
+                logger.info(f"Launched pooled browser ({len(self._instances)}/{self.max_size})")
+                return instance
+        except BaseException:
+            self._semaphore.release()
+            raise
+    
+    async def _release(self, instance: BrowserInstance) -> None:
+        """Return a browser to the pool."""
+        instance.in_use = False
+        try:
+            if self._is_expired(instance):
+                async with self._lock:
+                    await self._retire(instance)
+        finally:
+            self._semaphore.release()
+    
+    @asynccontextmanager
+    async def acquire_context(self, **context_options) -> AsyncIterator[Any]:
+        """
+        Check out a fresh BrowserContext on a pooled browser.
+        
+        Usage:
+            async with browser_pool.acquire_context() as context:
+                page = await context.new_page()
+        """
+        instance = await self._acquire()
+        context = None
+        try:
+            context = await instance.browser.new_context(**context_options)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser context: {e}")
+            await self._release(instance)
+    
+    async def warm_up(self, count: int = 1) -> None:
+        """Launch up to `count` idle browsers ahead of the first request."""
+        await self._ensure_started()
+        
+        async with self._lock:
+            while len(self._instances) < min(count, self.max_size):
+                browser = await self._playwright.chromium.launch(
+                    headless=settings.HEADLESS,
+                    args=CHROMIUM_ARGS
+                )
+                self._instances.append(BrowserInstance(browser=browser))
+        logger.info(f"Browser pool warmed ({len(self._instances)} idle)")
+    
+    async def close(self) -> None:
+        """Close all pooled browsers and stop Playwright."""
+        if self._playwright is None or self._loop is not asyncio.get_running_loop():
+            return
+        
+        playwright = self._playwright
+        browsers = [instance.browser for instance in self._instances]
+        self._playwright = None
+        self._loop = None
+        self._instances = []
+        await self._shutdown(playwright, browsers)
+        logger.info("Browser pool closed")
+
+
+# Global browser pool instance
+browser_pool = BrowserPool(
+    max_size=settings.BROWSER_POOL_SIZE,
+    max_pages_per_browser=settings.BROWSER_MAX_USES,
+    max_age_seconds=settings.BROWSER_MAX_AGE
+)
@@ -2,10 +2,28 @@
 Login Service - Playwright-based Simulated Login
 """
 import asyncio
+import atexit
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Tuple
 from loguru import logger
 
 from app.config import settings
+from app.account.browser_pool import browser_pool, CHROMIUM_COMMON_ARGS
+
+try:
+    from playwright.sync_api import sync_playwright
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+PLAYWRIGHT_MISSING_MSG = "Playwright not installed. Run: pip install playwright && playwright install chromium"
+
+
+# Xueqiu user menu, only present once logged in
+XUEQIU_LOGGED_IN_SELECTOR = ".user-name, .nav__user"
 
 
 class LoginService:
@@ -31,10 +49,8 @@ class LoginService:
         Returns:
             Tuple of (success, cookies_dict, error_message)
         """
-        try:
-            from playwright.async_api import async_playwright
-        except ImportError:
-            return False, None, "Playwright not installed. Run: pip install playwright && playwright install chromium"
+        if not PLAYWRIGHT_AVAILABLE:
+            return False, None, PLAYWRIGHT_MISSING_MSG
         
         if platform not in self.LOGIN_URLS:
             return False, None, f"Unsupported platform: {platform}"
@@ -42,9 +58,7 @@ class LoginService:
         login_url = self.LOGIN_URLS[platform]
         
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=settings.HEADLESS)
-                context = await browser.new_context()
+            async with browser_pool.acquire_context() as context:
                 page = await context.new_page()
                 
                 logger.info(f"Starting login for {platform}: {username}")
@@ -65,10 +79,8 @@ class LoginService:
                     cookies = await context.cookies()
                     cookies_dict = {c["name"]: c["value"] for c in cookies}
                     logger.info(f"Login successful for {platform}: {username}")
-                    await browser.close()
                     return True, cookies_dict, None
                 else:
-                    await browser.close()
                     return False, None, error
                     
         except Exception as e:
@@ -89,13 +101,14 @@ class LoginService:
             # Click login button
             await page.click('button[type="submit"]')
             
-            # Wait for redirect or error
-            await asyncio.sleep(3)
-            
-            # Check if login successful (redirected to home)
-            if "weibo.com" in page.url and "passport" not in page.url:
+            # Wait for redirect to home (login successful)
+            try:
+                await page.wait_for_url(
+                    lambda url: "weibo.com" in url and "passport" not in url,
+                    timeout=10000
+                )
                 return True, None
-            else:
+            except PlaywrightTimeoutError:
                 return False, "Login failed - check credentials or captcha required"
                 
         except Exception as e:
@@ -108,7 +121,6 @@ class LoginService:
             pwd_tab = page.locator('div[role="tab"]:has-text("密码登录")')
             if await pwd_tab.count() > 0:
                 await pwd_tab.click()
-                await asyncio.sleep(1)
             
             # Fill in credentials
             await page.fill('input[name="username"]', username)
@@ -117,12 +129,11 @@ class LoginService:
             # Click login button
             await page.click('button[type="submit"]')
             
-            await asyncio.sleep(3)
-            
-            # Check if login successful
-            if "/signin" not in page.url:
+            # Wait for redirect away from sign-in page (login successful)
+            try:
+                await page.wait_for_url(lambda url: "/signin" not in url, timeout=10000)
                 return True, None
-            else:
+            except PlaywrightTimeoutError:
                 return False, "Login failed - check credentials or captcha required"
                 
         except Exception as e:
@@ -135,7 +146,6 @@ class LoginService:
             login_btn = page.locator('a:has-text("登录")')
             if await login_btn.count() > 0:
                 await login_btn.click()
-                await asyncio.sleep(1)
             
             # Wait for login modal
             await page.wait_for_selector('input[name="username"]', timeout=10000)
@@ -147,146 +157,81 @@ class LoginService:
             # Click login button
             await page.click('button:has-text("登录")')
             
-            await asyncio.sleep(3)
-            
-            # Check if login successful
-            user_menu = page.locator('.user-name, .nav__user')
-            if await user_menu.count() > 0:
+            # Wait for user menu to appear (login successful)
+            try:
+                await page.wait_for_selector(XUEQIU_LOGGED_IN_SELECTOR, timeout=10000)
                 return True, None
-            else:
+            except PlaywrightTimeoutError:
                 return False, "Login failed - check credentials or captcha required"
                 
         except Exception as e:
             return False, str(e)
-    
-    async def login_with_cookies(
-        self,
-        platform: str,
-        cookies: Dict
-    ) -> Tuple[bool, Optional[str]]:
-        """
-        Verify login with existing cookies.
-        
-        Returns:
-            Tuple of (valid, error_message)
-        """
-        try:
-            from playwright.async_api import async_playwright
-        except ImportError:
-            return False, "Playwright not installed"
-        
-        base_urls = {
-            "weibo": settings.WEIBO_BASE_URL,
-            "zhihu": settings.ZHIHU_BASE_URL,
-            "xueqiu": settings.XUEQIU_BASE_URL,
-        }
-        
-        if platform not in base_urls:
-            return False, f"Unsupported platform: {platform}"
-        
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
-                
-                # Set cookies
-                cookie_list = [
-                    {"name": k, "value": v, "domain": base_urls[platform].split("//")[1], "path": "/"}
-                    for k, v in cookies.items()
-                ]
-                await context.add_cookies(cookie_list)
-                
-                # Navigate to check login status
-                page = await context.new_page()
-                await page.goto(base_urls[platform], timeout=settings.BROWSER_TIMEOUT)
-                
-                # Platform-specific login check
-                is_logged_in = await self._check_logged_in(page, platform)
-                
-                await browser.close()
-                
-                if is_logged_in:
-                    return True, None
-                else:
-                    return False, "Cookies expired or invalid"
-                    
-        except Exception as e:
-            return False, str(e)
-    
-    async def _check_logged_in(self, page, platform: str) -> bool:
-        """Check if currently logged in on platform."""
-        try:
-            if platform == "weibo":
-                # Check for user menu
-                return await page.locator('.gn_name, .woo-box-item-inlineBlock').count() > 0
-            elif platform == "zhihu":
-                # Check for user avatar
-                return await page.locator('.AppHeader-profile, .Avatar').count() > 0
-            elif platform == "xueqiu":
-                # Check for user menu
-                return await page.locator('.user-name, .nav__user').count() > 0
-            return False
-        except:
-            return False
+
+
+# Global login service instance (stateless; browsers come from the pool)
+login_service = LoginService()
 
 
 # Sync wrapper for use in non-async contexts
 def sync_login(platform: str, username: str, password: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
     """Synchronous wrapper for login."""
-    service = LoginService()
-    return asyncio.run(service.login(platform, username, password))
+    async def _run():
+        try:
+            return await login_service.login(platform, username, password)
+        finally:
+            await browser_pool.close()
+    
+    return asyncio.run(_run())
 
 
 # Platform-specific cookie keys for login detection
 PLATFORM_COOKIE_KEYS = {
-    "xueqiu": ["xq_a_token"],
-    "weibo": ["SUB", "SUBP"],
-    "zhihu": ["z_c0"],
+    "xueqiu": frozenset({"xq_a_token"}),
+    "weibo": frozenset({"SUB", "SUBP"}),
+    "zhihu": frozenset({"z_c0"}),
 }
 
+# Response types that can carry login Set-Cookie headers
+LOGIN_RESPONSE_TYPES = frozenset({"document", "xhr", "fetch"})
+
+# Shared executor for sync Playwright manual logins (caps concurrent browsers)
+_MANUAL_LOGIN_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="manual-login")
+atexit.register(_MANUAL_LOGIN_POOL.shutdown)
 
 
 async def manual_login(
     platform: str,
-    timeout: int = 120,
-    poll_interval: int = 2
+    timeout: int = 120
 ) -> Tuple[bool, Optional[Dict], Optional[str]]:
     """
-    Open a visible browser for manual login with cookie polling.
+    Open a visible browser for manual login with cookie detection.
     
     Uses sync Playwright API wrapped in thread executor to avoid
     Windows asyncio subprocess issues.
     """
-    import concurrent.futures
-    
     # Run sync version in thread pool to avoid Windows asyncio subprocess issues
     loop = asyncio.get_running_loop()
-    with concurrent.futures.ThreadPoolExecutor() as pool:
-        result = await loop.run_in_executor(
-            pool,
-            _sync_manual_login_impl,
-            platform,
-            timeout,
-            poll_interval
-        )
-    return result
+    return await loop.run_in_executor(
+        _MANUAL_LOGIN_POOL,
+        _sync_manual_login_impl,
+        platform,
+        timeout
+    )
 
 
 def _sync_manual_login_impl(
     platform: str,
-    timeout: int = 120,
-    poll_interval: int = 2
+    timeout: int = 120
 ) -> Tuple[bool, Optional[Dict], Optional[str]]:
     """
     Synchronous implementation of manual login.
     Opens a visible browser for user to manually complete login.
-    """
-    import time
     
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
-        return False, None, "Playwright not installed. Run: pip install playwright && playwright install chromium"
+    Cookies are re-checked whenever a document/XHR/fetch response
+    arrives, since that is when login cookies get set.
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        return False, None, PLAYWRIGHT_MISSING_MSG
     
     login_urls = LoginService.LOGIN_URLS
     
@@ -305,7 +250,7 @@ def _sync_manual_login_impl(
     try:
         with sync_playwright() as p:
             # Launch visible browser
-            browser = p.chromium.launch(headless=False)
+            browser = p.chromium.launch(headless=False, args=CHROMIUM_COMMON_ARGS)
             context = browser.new_context()
             page = context.new_page()
             
@@ -332,41 +277,33 @@ def _sync_manual_login_impl(
             baseline_values = {c["name"]: c["value"] for c in baseline_cookies}
             
             # Check if required cookies already exist in baseline (this is the problem!)
-            baseline_required = [k for k in required_cookies if k in baseline_names]
+            baseline_required = required_cookies & baseline_names
             logger.info(f"Baseline cookies after clear: {baseline_names}")
             if baseline_required:
                 logger.info(f"Warning: Required cookies {baseline_required} exist in baseline - will look for VALUE changes")
             
             logger.info(f"Please complete login in the browser window. Timeout: {timeout}s")
             
-            # Poll for cookies
-            start_time = time.time()
+            # Check cookies each time a login-relevant response arrives
+            deadline = time.time() + timeout
             
             while True:
-                elapsed = time.time() - start_time
-                
-                if elapsed >= timeout:
-                    browser.close()
-                    return False, None, f"Login timeout after {timeout} seconds"
-                
-                # Check cookies
                 cookies = context.cookies()
                 cookie_dict = {c["name"]: c["value"] for c in cookies}
                 
                 # Check if any required cookie is NEW or has CHANGED value
                 login_detected = False
-                for key in required_cookies:
-                    if key in cookie_dict:
-                        if key not in baseline_names:
-                            # New cookie appeared
-                            logger.info(f"New required cookie appeared: {key}")
-                            login_detected = True
-                            break
-                        elif cookie_dict[key] != baseline_values.get(key):
-                            # Cookie value changed
-                            logger.info(f"Required cookie value changed: {key}")
-                            login_detected = True
-                            break
+                for key in required_cookies & cookie_dict.keys():
+                    if key not in baseline_names:
+                        # New cookie appeared
+                        logger.info(f"New required cookie appeared: {key}")
+                        login_detected = True
+                        break
+                    elif cookie_dict[key] != baseline_values.get(key):
+                        # Cookie value changed
+                        logger.info(f"Required cookie value changed: {key}")
+                        login_detected = True
+                        break
                 
                 if login_detected:
                     # Login detected, save all cookies
@@ -375,11 +312,23 @@ def _sync_manual_login_impl(
                     browser.close()
                     return True, cookies_dict, None
                 
-                # Wait before next poll
-                time.sleep(poll_interval)
+                # Wait for the next response that could set cookies
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    browser.close()
+                    return False, None, f"Login timeout after {timeout} seconds"
+                
+                try:
+                    context.wait_for_event(
+                        "response",
+                        predicate=lambda r: r.request.resource_type in LOGIN_RESPONSE_TYPES,
+                        timeout=remaining * 1000
+                    )
+                except PlaywrightTimeoutError:
+                    browser.close()
+                    return False, None, f"Login timeout after {timeout} seconds"
                 
     except Exception as e:
-        import traceback
         error_detail = traceback.format_exc()
         error_msg = f"Manual login error: {str(e) or 'Unknown error'}"
         logger.error(f"{error_msg}\n{error_detail}")
@@ -1,14 +1,23 @@
 """
 Account Manager - Account CRUD and Cookie Management
 """
+import asyncio
+import re
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from loguru import logger
+from cachetools import TTLCache
+import httpx
 
 from app.core.models import PlatformAccount, LoginStatus
 from app.storage.repositories import AccountRepository
 
 
+# Cookies of the active account per platform, shared across managers.
+# Entries are dropped whenever an account is changed through the manager.
+_cookie_cache: TTLCache = TTLCache(maxsize=32, ttl=60)
+
+
 class AccountManager:
     """Manager for platform account operations."""
     
@@ -20,28 +29,43 @@ class AccountManager:
         """Get all platform accounts."""
         return self.repo.get_all()
     
-    def get_accounts_status(self) -> Dict[str, Any]:
-        """Get account status summary."""
-        accounts = self.repo.get_all()
-        online_count = sum(1 for a in accounts if a.login_status == LoginStatus.ONLINE.value)
-        offline_count = len(accounts) - online_count
+    def get_status_counts(self) -> Dict[str, int]:
+        """Get online/offline account counts without loading accounts."""
+        counts = self.repo.status_counts()
+        online_count = counts.get(LoginStatus.ONLINE.value, 0)
+        offline_count = sum(counts.values()) - online_count
         
         return {
-            "accounts": accounts,
             "online_count": online_count,
             "offline_count": offline_count
         }
     
+    def get_accounts_status(self) -> Dict[str, Any]:
+        """Get account status summary."""
+        return {
+            "accounts": self.repo.get_all(),
+            **self.get_status_counts()
+        }
+    
     def get_account_by_platform(self, platform: str) -> Optional[PlatformAccount]:
         """Get active account for a platform."""
         return self.repo.get_active_by_platform(platform)
     
     def get_cookies(self, platform: str) -> Optional[Dict]:
-        """Get cookies for active account on platform."""
+        """Get cookies for active account on platform (cached briefly)."""
+        if platform in _cookie_cache:
+            return _cookie_cache[platform]
+        
         account = self.get_account_by_platform(platform)
-        if account and account.cookies:
-            return account.cookies
-        return None
+        cookies = account.cookies if account and account.cookies else None
+        _cookie_cache[platform] = cookies
+        return cookies
+    
+    def _invalidate_cookies(self, account: Optional[PlatformAccount]) -> Optional[PlatformAccount]:
+        """Drop cached cookies for the account's platform."""
+        if account is not None:
+            _cookie_cache.pop(account.platform, None)
+        return account
     
     def create_or_update_account(
         self,
@@ -52,6 +76,7 @@ class AccountManager:
     ) -> PlatformAccount:
         """Create new account or update existing one."""
         existing = self.repo.get_by_platform_username(platform, username)
+        _cookie_cache.pop(platform, None)
         
         if existing:
             logger.info(f"Updating existing account: {platform}/{username}")
@@ -59,6 +84,7 @@ class AccountManager:
                 existing.id,
                 login_type=login_type,
                 cookies=cookies,
+                last_health_check_at=None,
                 login_status=LoginStatus.ONLINE.value if cookies else existing.login_status
             )
         else:
@@ -78,11 +104,11 @@ class AccountManager:
     ) -> Optional[PlatformAccount]:
         """Update account after successful login."""
         logger.info(f"Login success for account ID: {account_id}")
-        return self.repo.update_login_status(
+        return self._invalidate_cookies(self.repo.update_login_status(
             account_id,
             status=LoginStatus.ONLINE.value,
             cookies=cookies
-        )
+        ))
     
     def update_login_failure(
         self,
@@ -91,22 +117,50 @@ class AccountManager:
     ) -> Optional[PlatformAccount]:
         """Update account after login failure."""
         logger.warning(f"Login failed for account ID: {account_id}, error: {error}")
-        return self.repo.update_login_status(
+        return self._invalidate_cookies(self.repo.update_login_status(
             account_id,
             status=LoginStatus.ERROR.value,
             error=error
-        )
+        ))
     
     def set_offline(self, account_id: int) -> Optional[PlatformAccount]:
         """Set account to offline status."""
-        return self.repo.update_login_status(
+        return self._invalidate_cookies(self.repo.update_login_status(
             account_id,
             status=LoginStatus.OFFLINE.value
+        ))
+    
+    def sync_login_statuses(
+        self,
+        to_online: List[PlatformAccount],
+        to_offline: List[PlatformAccount],
+        checked: Dict[int, Tuple[bool, Optional[str]]] = None
+    ) -> None:
+        """
+        Persist health check results for many accounts in one commit.
+        
+        Args:
+            to_online: Accounts to mark online
+            to_offline: Accounts to mark offline
+            checked: Fresh (is_healthy, error) results by account ID
+        """
+        checked = checked or {}
+        if not to_online and not to_offline and not checked:
+            return
+        
+        if to_online or to_offline:
+            logger.info(f"Syncing login status: {len(to_online)} online, {len(to_offline)} offline")
+        self.repo.bulk_set_login_status(
+            [acc.id for acc in to_online],
+            [acc.id for acc in to_offline],
+            checked=checked
         )
+        for account in (*to_online, *to_offline):
+            self._invalidate_cookies(account)
     
     def deactivate_account(self, account_id: int) -> Optional[PlatformAccount]:
         """Deactivate an account."""
-        return self.repo.update(account_id, is_active=False)
+        return self._invalidate_cookies(self.repo.update(account_id, is_active=False))
 
 
 # Health check URLs for each platform (use main pages that require login)
@@ -116,6 +170,13 @@ HEALTH_CHECK_URLS = {
     "zhihu": "https://www.zhihu.com/",
 }
 
+# Lightweight authenticated JSON endpoints, preferred over the main page.
+# They answer 401/403 once the session is dead; platforms without a known
+# auth probe fall back to the HTML check.
+HEALTH_CHECK_ENDPOINTS = {
+    "zhihu": "https://www.zhihu.com/api/v4/me",
+}
+
 # Required cookies for each platform to consider logged in
 REQUIRED_COOKIES = {
     "xueqiu": ["xq_a_token"],
@@ -124,13 +185,59 @@ REQUIRED_COOKIES = {
 }
 
 
+# Case-insensitive <html tag marker, searched in the first bytes of the body
+_HTML_TAG_RE = re.compile(rb"<html", re.IGNORECASE)
+
+# Maximum number of health checks in flight at once
+HEALTH_CHECK_CONCURRENCY = 10
+
+# Reuse a stored health check result if it is younger than this (seconds)
+HEALTH_CHECK_TTL = 30
+
+# Shared connection pool for health checks (keeps TCP/TLS connections alive)
+_health_transport: Optional[httpx.AsyncHTTPTransport] = None
+
+
+def _get_health_transport() -> httpx.AsyncHTTPTransport:
+    """Get the shared health check transport, creating it on first use."""
+    global _health_transport
+    if _health_transport is None:
+        _health_transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100)
+        )
+    return _health_transport
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Borrow the shared health check transport without closing it with the client."""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+    
+    async def aclose(self) -> None:
+        pass  # The pool is closed by close_health_transport()
+
+
+async def close_health_transport() -> None:
+    """Close the shared health check connection pool."""
+    global _health_transport
+    if _health_transport is not None:
+        await _health_transport.aclose()
+        _health_transport = None
+
+
 async def check_account_health(account: PlatformAccount) -> Tuple[bool, Optional[str]]:
     """
-    Verify if stored cookies are still valid by fetching the main page.
+    Verify if stored cookies are still valid.
     
     Health check logic:
     - Check if required cookies exist
-    - Fetch main page and verify 200 OK with HTML content
+    - If the platform has a JSON auth endpoint, verify 200 OK with JSON
+    - Otherwise fetch main page and verify 200 OK with HTML content
     
     Args:
         account: PlatformAccount instance with cookies
@@ -138,8 +245,6 @@ async def check_account_health(account: PlatformAccount) -> Tuple[bool, Optional
     Returns:
         Tuple of (is_healthy, error_message)
     """
-    import httpx
-    
     platform = account.platform
     
     if platform not in HEALTH_CHECK_URLS:
@@ -156,32 +261,78 @@ async def check_account_health(account: PlatformAccount) -> Tuple[bool, Optional
     if not has_required:
         return False, f"Missing required cookies: {required}"
     
-    url = HEALTH_CHECK_URLS[platform]
+    endpoint = HEALTH_CHECK_ENDPOINTS.get(platform)
+    url = endpoint or HEALTH_CHECK_URLS[platform]
     
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept": "application/json" if endpoint else "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
     
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            response = await client.get(url, cookies=cookies, headers=headers)
-            
-            # Check for successful response
-            if response.status_code == 200:
-                html = response.text
-                # Basic check: HTML should contain <html> tag and be reasonably long
-                if "<html" in html.lower() and len(html) > 1000:
-                    return True, None
-                else:
-                    return False, f"Invalid HTML response (len={len(html)})"
-            elif response.status_code in (401, 403):
-                return False, f"Auth failed: {response.status_code}"
+        # A per-account client keeps cookie jars isolated while connections
+        # come from the shared transport
+        async with httpx.AsyncClient(
+            transport=_SharedTransport(_get_health_transport()),
+            cookies=cookies,
+            timeout=15.0,
+            follow_redirects=True
+        ) as client:
+            response = await client.get(url, headers=headers)
+        
+        # Check for successful response
+        if response.status_code == 200 and endpoint:
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("application/json"):
+                return True, None
+            else:
+                return False, f"Invalid JSON response (content-type={content_type})"
+        elif response.status_code == 200:
+            body = response.content
+            # Basic check: HTML should be reasonably long and open with an <html> tag
+            if len(body) > 1000 and _HTML_TAG_RE.search(body, 0, 4096):
+                return True, None
             else:
-                return False, f"Health check failed: {response.status_code}"
-            
+                return False, f"Invalid HTML response (len={len(body)})"
+        elif response.status_code in (401, 403):
+            return False, f"Auth failed: {response.status_code}"
+        else:
+            return False, f"Health check failed: {response.status_code}"
+    
     except httpx.TimeoutException:
         return False, "Health check timed out"
     except Exception as e:
         logger.error(f"Health check error for {platform}: {e}")
         return False, f"Health check error: {str(e)}"
+
+
+async def check_all(
+    accounts: List[PlatformAccount]
+) -> List[Tuple[PlatformAccount, Tuple[bool, Optional[str]]]]:
+    """
+    Run health checks for many accounts concurrently.
+    
+    At most HEALTH_CHECK_CONCURRENCY checks are in flight at once. A check
+    that raises is reported as unhealthy instead of failing the batch.
+    
+    Returns:
+        List of (account, (is_healthy, error_message)) in input order
+    """
+    sem = asyncio.Semaphore(HEALTH_CHECK_CONCURRENCY)
+    
+    async def one(account: PlatformAccount):
+        async with sem:
+            return account, await check_account_health(account)
+    
+    results = await asyncio.gather(
+        *(one(account) for account in accounts),
+        return_exceptions=True
+    )
+    
+    checks = []
+    for account, result in zip(accounts, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Health check crashed for account {account.id}: {result}")
+            result = (account, (False, f"Health check error: {result}"))
+        checks.append(result)
+    return checks
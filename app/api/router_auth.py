@@ -13,14 +13,24 @@ from app.core.schemas import (
     LoginRequest, AuthStatusResponse, PlatformAccountResponse
 )
 from app.storage.database import get_db
-from app.account.manager import AccountManager, check_account_health
-from app.account.login_service import LoginService, manual_login
-from app.config.settings import beijing_now
+from app.account.manager import AccountManager, HEALTH_CHECK_TTL, check_account_health, check_all
+from app.account.login_service import LoginService, login_service, manual_login
+from app.config.settings import beijing_now, BEIJING_TZ
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def get_account_manager(db: Session = Depends(get_db)) -> AccountManager:
+    """Dependency: account manager bound to the request's session."""
+    return AccountManager(db)
+
+
+def get_login_service() -> LoginService:
+    """Dependency: process-wide login service."""
+    return login_service
+
+
 class ManualLoginRequest(BaseModel):
     """Request body for manual login."""
     platform: str
@@ -47,32 +57,67 @@ class AuthStatusWithHealthResponse(BaseModel):
 
 
 @router.get("/status", response_model=AuthStatusWithHealthResponse)
-async def get_auth_status(db: Session = Depends(get_db)):
+async def get_auth_status(manager: AccountManager = Depends(get_account_manager)):
     """
     Get account status for all platforms with health check.
     Shows which accounts are online/offline and their current health status.
     """
-    manager = AccountManager(db)
     accounts = manager.get_all_accounts()
     
-    # Perform health check for each account with cookies
+    # One timestamp for the whole batch of checks
+    now = beijing_now()
+    checked_at_iso = now.isoformat()
+    
+    # Reuse recent results; only stale accounts with cookies hit the network
+    check_results = {}
+    checked_at = {}
+    stale = []
+    for acc in accounts:
+        if not acc.cookies:
+            continue
+        last = acc.last_health_check_at
+        if last and acc.last_health_ok is not None and \
+                (now.replace(tzinfo=None) - last).total_seconds() < HEALTH_CHECK_TTL:
+            check_results[acc.id] = (acc.last_health_ok, acc.last_health_error)
+            checked_at[acc.id] = last.replace(tzinfo=BEIJING_TZ).isoformat()
+        else:
+            stale.append(acc)
+    
+    # Perform health checks concurrently for the rest
+    checks = await check_all(stale) if stale else []
+    fresh = {acc.id: result for acc, result in checks}
+    check_results.update(fresh)
+    
+    # Collect accounts whose login_status disagrees with the health check
+    to_online = []
+    to_offline = []
+    for acc in accounts:
+        if acc.id not in check_results:
+            continue
+        is_healthy, _ = check_results[acc.id]
+        if is_healthy and acc.login_status != "online":
+            to_online.append(acc)
+        elif not is_healthy and acc.login_status == "online":
+            to_offline.append(acc)
+    
+    # Sync login_status and record fresh results in a single commit
+    if to_online or to_offline or fresh:
+        manager.sync_login_statuses(
+            to_online,
+            to_offline,
+            checked=fresh
+        )
+        # Commit expired the loaded accounts; reload them in one query
+        accounts = manager.get_all_accounts()
+    
     health_results = []
+    online_count = 0
     for acc in accounts:
-        is_healthy = False
-        health_error = None
-        
-        if acc.cookies:
-            is_healthy, health_error = await check_account_health(acc)
-            
-            # Sync login_status with health check result
-            if is_healthy and acc.login_status != "online":
-                manager.update_login_success(acc.id, acc.cookies)
-                acc.login_status = "online"
-            elif not is_healthy and acc.login_status == "online":
-                manager.set_offline(acc.id)
-                acc.login_status = "offline"
+        is_healthy, health_error = check_results.get(acc.id, (False, None))
+        online_count += is_healthy
         
-        health_results.append(AccountHealthStatus(
+        # Values are server-generated, so skip per-item validation
+        health_results.append(AccountHealthStatus.model_construct(
             account_id=acc.id,
             platform=acc.platform,
             username=acc.username,
@@ -80,13 +125,12 @@ async def get_auth_status(db: Session = Depends(get_db)):
             is_healthy=is_healthy,
             health_error=health_error,
             last_login_at=acc.last_login_at.isoformat() if acc.last_login_at else None,
-            checked_at=beijing_now().isoformat()
+            checked_at=checked_at.get(acc.id, checked_at_iso)
         ))
     
-    online_count = sum(1 for r in health_results if r.is_healthy)
     offline_count = len(health_results) - online_count
     
-    return AuthStatusWithHealthResponse(
+    return AuthStatusWithHealthResponse.model_construct(
         accounts=health_results,
         online_count=online_count,
         offline_count=offline_count
@@ -96,7 +140,7 @@ async def get_auth_status(db: Session = Depends(get_db)):
 @router.post("/manual-login")
 async def manual_login_endpoint(
     request: ManualLoginRequest,
-    db: Session = Depends(get_db)
+    manager: AccountManager = Depends(get_account_manager)
 ):
     """
     Perform manual login for a platform account.
@@ -105,8 +149,6 @@ async def manual_login_endpoint(
     (via QR code scan or credentials). Cookies are automatically
     detected and saved when login succeeds.
     """
-    manager = AccountManager(db)
-    
     logger.info(f"Starting manual login for {request.platform}")
     
     try:
@@ -149,16 +191,14 @@ async def manual_login_endpoint(
 @router.post("/login")
 async def login(
     request: LoginRequest,
-    db: Session = Depends(get_db)
+    manager: AccountManager = Depends(get_account_manager),
+    login_service: LoginService = Depends(get_login_service)
 ):
     """
     Perform simulated login for a platform account.
     
     Uses Playwright to automate the login process.
     """
-    manager = AccountManager(db)
-    login_service = LoginService()
-    
     # Create or get account
     account = manager.create_or_update_account(
         platform=request.platform,
@@ -203,10 +243,9 @@ async def login(
 @router.post("/logout/{account_id}")
 async def logout(
     account_id: int,
-    db: Session = Depends(get_db)
+    manager: AccountManager = Depends(get_account_manager)
 ):
     """Set account to offline status."""
-    manager = AccountManager(db)
     account = manager.set_offline(account_id)
     
     if not account:
@@ -221,12 +260,9 @@ async def logout(
 @router.post("/verify/{account_id}")
 async def verify_cookies(
     account_id: int,
-    db: Session = Depends(get_db)
+    manager: AccountManager = Depends(get_account_manager)
 ):
     """Verify if stored cookies are still valid."""
-    manager = AccountManager(db)
-    login_service = LoginService()
-    
     account = manager.repo.get_by_id(account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
@@ -237,10 +273,7 @@ async def verify_cookies(
             "message": "No cookies stored"
         }
     
-    valid, error = await login_service.login_with_cookies(
-        platform=account.platform,
-        cookies=account.cookies
-    )
+    valid, error = await check_account_health(account)
     
     if valid:
         return {
@@ -1,29 +1,55 @@
 """
 Public API Router - Health Check and Snapshot Endpoints
 """
+import asyncio
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from typing import List, Optional, Tuple
+from uuid import uuid4
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session
+from loguru import logger
 
 from app.config import settings
-from app.core.schemas import HealthResponse, SnapshotResponse, SentimentItemResponse
+from app.config.settings import beijing_now
+from app.core.schemas import HealthResponse, SnapshotResponse, SENTIMENT_LIST_ADAPTER
 from app.core.utils import get_date_range
-from app.storage.database import get_db
-from app.storage.repositories import SentimentRepository
+from app.crawler import CrawlerProtocol, WeiboCrawler, ZhihuCrawler, XueqiuCrawler
+from app.storage.database import SessionLocal, get_db
+from app.storage.repositories import WatchTargetRepository, SentimentRepository, AccountRepository
 
 
 router = APIRouter()
 
+# Crawler per platform, in crawl order for platform=all
+_CRAWLER_CLASSES = {
+    "weibo": WeiboCrawler,
+    "zhihu": ZhihuCrawler,
+    "xueqiu": XueqiuCrawler,
+}
+_VALID_PLATFORMS = frozenset(_CRAWLER_CLASSES) | {"all"}
 
-@router.get("/health", response_model=HealthResponse)
+# Max watch targets fetched at once per platform during a manual crawl
+CRAWL_TARGET_CONCURRENCY = 8
+
+# Manual crawl jobs by id (in-memory, per process) and their running tasks
+_crawl_jobs: TTLCache = TTLCache(maxsize=100, ttl=24 * 3600)
+_crawl_tasks: set = set()
+
+
+@router.get(
+    "/health",
+    response_class=JSONResponse,
+    responses={200: {"model": HealthResponse}}
+)
 async def health_check():
-    """Health check endpoint."""
-    return HealthResponse(
-        status="healthy",
-        version=settings.APP_VERSION,
-        timestamp=datetime.utcnow()
-    )
+    """Health check endpoint (polled often, so it skips model validation)."""
+    return JSONResponse({
+        "status": "healthy",
+        "version": settings.APP_VERSION,
+        "timestamp": datetime.utcnow().isoformat()
+    })
 
 
 @router.get("/snapshot", response_model=SnapshotResponse)
@@ -57,56 +83,101 @@ async def get_snapshot(
         page_size=page_size
     )
     
-    # Convert to response model
-    response_items = [
-        SentimentItemResponse.model_validate(item)
-        for item in items
-    ]
+    # Convert the whole page to response models in a single pydantic-core call
+    response_items = SENTIMENT_LIST_ADAPTER.validate_python(items, from_attributes=True)
     
-    return SnapshotResponse(
+    # Items are already validated; serialize straight to JSON bytes so
+    # FastAPI does not validate the response a second time
+    snapshot = SnapshotResponse.model_construct(
         items=response_items,
         total=total,
         page=page,
         page_size=page_size
     )
+    return Response(content=snapshot.model_dump_json(), media_type="application/json")
 
 
-@router.post("/crawl")
+@router.post("/crawl", status_code=202)
 async def trigger_crawl(
-    platform: str = Query(..., description="Platform to crawl: weibo/zhihu/xueqiu/all"),
-    db: Session = Depends(get_db)
+    platform: str = Query(..., description="Platform to crawl: weibo/zhihu/xueqiu/all")
 ):
     """
     Manually trigger crawling for a platform.
     Crawls data from today 00:00 to current time.
-    """
-    from datetime import timedelta
-    from app.config.settings import beijing_now, BEIJING_TZ
-    from app.crawler import WeiboCrawler, ZhihuCrawler, XueqiuCrawler
-    from app.storage.repositories import WatchTargetRepository, SentimentRepository, AccountRepository
-    from app.core.models import LoginStatus
-    from loguru import logger
     
+    The crawl runs in the background; poll GET /crawl/{job_id} for the result.
+    """
     # Get today's date range (Beijing time)
     now = beijing_now()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     
     # Validate platform
-    valid_platforms = ["weibo", "zhihu", "xueqiu", "all"]
-    if platform not in valid_platforms:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=400, detail=f"Invalid platform. Must be one of: {valid_platforms}")
+    if platform not in _VALID_PLATFORMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid platform. Must be one of: {[*_CRAWLER_CLASSES, 'all']}"
+        )
     
     # Get platforms to crawl
-    platforms_to_crawl = [platform] if platform != "all" else ["weibo", "zhihu", "xueqiu"]
+    platforms_to_crawl = [platform] if platform != "all" else list(_CRAWLER_CLASSES)
     
-    # Crawler mapping
-    crawler_classes = {
-        "weibo": WeiboCrawler,
-        "zhihu": ZhihuCrawler,
-        "xueqiu": XueqiuCrawler,
+    job_id = uuid4().hex
+    _crawl_jobs[job_id] = {
+        "job_id": job_id,
+        "platform": platform,
+        "status": "running",
+        "started_at": now.isoformat(),
+        "finished_at": None,
+        "result": None,
+        "error": None,
     }
     
+    # Keep a reference so the task is not garbage collected mid-run
+    task = asyncio.create_task(_run_crawl_job(job_id, platforms_to_crawl, today_start, now))
+    _crawl_tasks.add(task)
+    task.add_done_callback(_crawl_tasks.discard)
+    
+    logger.info(f"Crawl job {job_id} accepted for {platform}")
+    return {"status": "accepted", "job_id": job_id}
+
+
+@router.get("/crawl/{job_id}")
+async def get_crawl_job(job_id: str):
+    """Get status and result of a background crawl job."""
+    job = _crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    return job
+
+
+async def _run_crawl_job(
+    job_id: str,
+    platforms_to_crawl: List[str],
+    today_start: datetime,
+    now: datetime
+) -> None:
+    """Run a crawl in the background and record its outcome."""
+    job = _crawl_jobs.get(job_id, {})
+    db = SessionLocal()
+    try:
+        job["result"] = await _crawl(db, platforms_to_crawl, today_start, now)
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error(f"Crawl job {job_id} failed: {e}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        db.close()
+        job["finished_at"] = beijing_now().isoformat()
+
+
+async def _crawl(
+    db: Session,
+    platforms_to_crawl: List[str],
+    today_start: datetime,
+    now: datetime
+) -> dict:
+    """Crawl the given platforms for [today_start, now] and save new items."""
     account_repo = AccountRepository(db)
     target_repo = WatchTargetRepository(db)
     sentiment_repo = SentimentRepository(db)
@@ -114,9 +185,10 @@ async def trigger_crawl(
     results = {}
     total_items = 0
     
+    # Gather DB state up front; crawl tasks only touch the session to save
+    # batches, which runs synchronously between awaits
+    jobs = []
     for plat in platforms_to_crawl:
-        logger.info(f"Starting crawl for {plat}")
-        
         # Get active account with cookies
         account = account_repo.get_active_by_platform(plat)
         if not account or not account.cookies:
@@ -126,54 +198,54 @@ async def trigger_crawl(
         # Get watch targets for this platform
         targets = target_repo.get_by_platform(plat)
         
-        # Initialize crawler
-        crawler_class = crawler_classes.get(plat)
-        if not crawler_class:
-            results[plat] = {"success": False, "error": "Crawler not found"}
+        jobs.append((plat, account.cookies, targets))
+    
+    async def crawl_one(plat: str, cookies: dict, targets: list) -> Tuple[int, int]:
+        """Fetch and save items for one platform; returns (fetched, saved)."""
+        logger.info(f"Starting crawl for {plat}")
+        crawler: CrawlerProtocol = _CRAWLER_CLASSES[plat](cookies=cookies)
+        
+        # Every platform falls back to its following feed without watch targets
+        if not targets:
+            logger.info(f"{plat}: using following feed (no watch targets)")
+            async with crawler:
+                items = await crawler.fetch_following_feed(today_start, now)
+            return len(items), sentiment_repo.bulk_create(items)
+        
+        # Fetch from configured targets, a few at a time, saving (with
+        # deduplication) each target's batch as soon as it arrives
+        fetched = saved = 0
+        async with crawler:
+            async for _, items in crawler.iter_fetch(targets, today_start, now, CRAWL_TARGET_CONCURRENCY):
+                fetched += len(items)
+                saved += sentiment_repo.bulk_create(items)
+        return fetched, saved
+    
+    # Platforms are independent, so crawl them concurrently
+    gathered = await asyncio.gather(
+        *(crawl_one(plat, cookies, targets) for plat, cookies, targets in jobs),
+        return_exceptions=True
+    )
+    
+    for (plat, _, targets), outcome in zip(jobs, gathered):
+        if isinstance(outcome, BaseException):
+            logger.error(f"Crawl error for {plat}: {outcome}")
+            results[plat] = {"success": False, "error": str(outcome)}
             continue
         
-        crawler = crawler_class(cookies=account.cookies)
+        fetched, created_count = outcome
+        total_items += created_count
         
-        # Fetch data
-        platform_items = []
-        try:
-            # For Xueqiu/Zhihu/Weibo: if no watch targets, use following feed
-            if plat == "xueqiu" and not targets:
-                logger.info("Xueqiu: using following feed (no watch targets)")
-                items = await crawler.fetch_following_feed(today_start, now)
-                platform_items.extend(items)
-            elif plat == "zhihu" and not targets:
-                logger.info("Zhihu: using following feed (no watch targets)")
-                items = await crawler.fetch_following_feed(today_start, now)
-                platform_items.extend(items)
-            elif plat == "weibo" and not targets:
-                logger.info("Weibo: using following feed (no watch targets)")
-                items = await crawler.fetch_following_feed(today_start, now)
-                platform_items.extend(items)
-            elif not targets:
-                results[plat] = {"success": False, "error": "No watch targets configured"}
-                continue
-            else:
-                # Fetch from configured targets
-                for target in targets:
-                    items = await crawler.fetch(target, today_start, now)
-                    platform_items.extend(items)
-            
-            # Save to database (with deduplication)
-            created_count = sentiment_repo.bulk_create(platform_items)
-            total_items += created_count
-            
-            results[plat] = {
-                "success": True,
-                "targets": len(targets),
-                "fetched": len(platform_items),
-                "saved": created_count
-            }
-            logger.info(f"Crawl complete for {plat}: fetched {len(platform_items)}, saved {created_count}")
-            
-        except Exception as e:
-            logger.error(f"Crawl error for {plat}: {e}")
-            results[plat] = {"success": False, "error": str(e)}
+        results[plat] = {
+            "success": True,
+            "targets": len(targets),
+            "fetched": fetched,
+            "saved": created_count
+        }
+        logger.info(f"Crawl complete for {plat}: fetched {fetched}, saved {created_count}")
+    
+    # Report platforms in request order
+    results = {plat: results[plat] for plat in platforms_to_crawl}
     
     return {
         "message": "Crawl completed",
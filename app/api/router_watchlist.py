@@ -3,8 +3,10 @@ Watchlist API Router - CRUD endpoints for watch targets.
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from cachetools import TTLCache
 
 from app.storage.database import get_db
 from app.storage.repositories import WatchTargetRepository
@@ -12,6 +14,12 @@ from app.core.schemas import WatchTargetCreate, WatchTargetResponse
 
 router = APIRouter(prefix="/watchlist", tags=["watchlist"])
 
+# Serialized (JSON) target lists keyed by platform filter (None = all enabled).
+# Cleared on every write through this router; per-process only.
+_watchlist_cache: TTLCache = TTLCache(maxsize=16, ttl=30)
+
+_WATCHLIST_ADAPTER = TypeAdapter(List[WatchTargetResponse])
+
 
 class WatchTargetUpdate(BaseModel):
     """Update watch target request."""
@@ -30,6 +38,9 @@ async def list_watch_targets(
     """
     List all watch targets, optionally filtered by platform.
     """
+    if platform in _watchlist_cache:
+        return Response(content=_watchlist_cache[platform], media_type="application/json")
+    
     repo = WatchTargetRepository(db)
     
     if platform:
@@ -37,7 +48,12 @@ async def list_watch_targets(
     else:
         targets = repo.get_all_enabled()
     
-    return targets
+    # Cache JSON bytes rather than ORM objects bound to this session
+    content = _WATCHLIST_ADAPTER.dump_json(
+        _WATCHLIST_ADAPTER.validate_python(targets, from_attributes=True)
+    )
+    _watchlist_cache[platform] = content
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/all")
@@ -45,25 +61,12 @@ async def list_all_watch_targets(db: Session = Depends(get_db)):
     """
     List all watch targets grouped by platform.
     """
-    from app.core.models import WatchTarget
-    
-    targets = db.query(WatchTarget).all()
+    repo = WatchTargetRepository(db)
     
-    # Group by platform
+    # Rows arrive ordered by platform, so grouping is a single pass
     grouped = {}
-    for t in targets:
-        if t.platform not in grouped:
-            grouped[t.platform] = []
-        grouped[t.platform].append({
-            "id": t.id,
-            "platform": t.platform,
-            "target_type": t.target_type,
-            "external_id": t.external_id,
-            "symbol": t.symbol,
-            "keyword": t.keyword,
-            "display_name": t.display_name,
-            "enabled": t.enabled,
-        })
+    for row in repo.list_all_rows():
+        grouped.setdefault(row["platform"], []).append(row)
     
     return grouped
 
@@ -95,6 +98,7 @@ async def create_watch_target(
     """
     repo = WatchTargetRepository(db)
     
+    _watchlist_cache.clear()
     target = repo.create(
         platform=request.platform,
         target_type=request.target_type,
@@ -118,14 +122,14 @@ async def update_watch_target(
     """
     repo = WatchTargetRepository(db)
     
-    target = repo.get_by_id(target_id)
-    if not target:
-        raise HTTPException(status_code=404, detail="Watch target not found")
-    
     # Only update provided fields
     update_data = request.model_dump(exclude_unset=True)
+    _watchlist_cache.clear()
     target = repo.update(target_id, **update_data)
     
+    if not target:
+        raise HTTPException(status_code=404, detail="Watch target not found")
+    
     return target
 
 
@@ -143,6 +147,7 @@ async def delete_watch_target(
     if not target:
         raise HTTPException(status_code=404, detail="Watch target not found")
     
+    _watchlist_cache.clear()
     success = repo.delete(target_id)
     
     return {"success": success, "message": "Watch target deleted"}
@@ -2,9 +2,10 @@
 Crystal System Configuration
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -22,6 +23,9 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = f"sqlite:///{BASE_DIR / 'data' / 'crystal.db'}"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds
     
     # API
     API_PREFIX: str = "/api/v1"
@@ -36,28 +40,40 @@ class Settings(BaseSettings):
     # Playwright
     HEADLESS: bool = True
     BROWSER_TIMEOUT: int = 30000  # 30 seconds
+    BROWSER_POOL_SIZE: int = 2  # Warm Chromium instances kept for login
+    BROWSER_MAX_USES: int = 100  # Contexts served before a browser is recycled
+    BROWSER_MAX_AGE: int = 3600  # seconds
+    BROWSER_WARMUP: int = 0  # Browsers launched at startup (0 = launch on first login)
     
     # Platform-specific settings
     WEIBO_BASE_URL: str = "https://weibo.com"
     ZHIHU_BASE_URL: str = "https://www.zhihu.com"
     XUEQIU_BASE_URL: str = "https://xueqiu.com"
+    CRAWL_RATE_LIMIT: float = 5.0  # HTTP requests per second, per platform
     
     # Manual Login
     MANUAL_LOGIN_TIMEOUT: int = 120  # seconds
     MANUAL_LOGIN_POLL_INTERVAL: int = 2  # seconds
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        frozen=True
+    )
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Ensure directories exist
+    def ensure_dirs(self) -> None:
+        """Create data and log directories. Call once at startup."""
         self.DATA_DIR.mkdir(parents=True, exist_ok=True)
         self.LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings (parsed once)."""
+    return Settings()
+
+
+settings = get_settings()
 
 
 # Beijing timezone utility
@@ -7,12 +7,17 @@ from sqlalchemy import (
     Column, Integer, String, Text, Boolean, DateTime, Float, JSON,
     UniqueConstraint, Index, Enum as SQLEnum
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase, relationship
 import enum
 
 from app.config.settings import beijing_now
 
 
+# Binary JSONB on Postgres, plain JSON (text) elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
 class Base(DeclarativeBase):
     """Base class for all models."""
     pass
@@ -66,7 +71,10 @@ class PlatformAccount(Base):
     login_status = Column(String(20), default=LoginStatus.OFFLINE.value)
     last_login_at = Column(DateTime, nullable=True)
     last_error = Column(Text, nullable=True)
-    cookies = Column(JSON, nullable=True)
+    cookies = Column(JSONType, nullable=True)
+    last_health_check_at = Column(DateTime, nullable=True)
+    last_health_ok = Column(Boolean, nullable=True)
+    last_health_error = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=beijing_now)
     updated_at = Column(DateTime, default=beijing_now, onupdate=beijing_now)
@@ -100,10 +108,11 @@ class SentimentItem(Base):
     """Sentiment record table for captured posts/comments."""
     __tablename__ = "sentiment_item"
     
+    # platform and symbol lookups are served by the composite indexes below
     id = Column(Integer, primary_key=True, autoincrement=True)
-    platform = Column(String(20), nullable=False, index=True)
+    platform = Column(String(20), nullable=False)
     target_id = Column(Integer, nullable=True)  # Reference to watch_target
-    symbol = Column(String(20), nullable=True, index=True)
+    symbol = Column(String(20), nullable=True)
     root_post_id = Column(String(100), nullable=True)  # Main post ID
     comment_id = Column(String(100), nullable=False)  # Comment ID (unique)
     author_id = Column(String(100), nullable=True)
@@ -115,12 +124,23 @@ class SentimentItem(Base):
     sentiment_score = Column(Float, nullable=True)  # Sentiment score
     heat_score = Column(Float, nullable=True)  # Heat/popularity score
     topic = Column(String(200), nullable=True)
-    extra = Column(JSON, nullable=True)  # Extended JSON field
+    extra = Column(JSONType, nullable=True)  # Extended JSON field
+    
+    # target_id has no FK constraint; lazy="raise" makes any load explicit
+    target = relationship(
+        "WatchTarget",
+        primaryjoin="foreign(SentimentItem.target_id) == WatchTarget.id",
+        lazy="raise",
+        viewonly=True,
+    )
     
     __table_args__ = (
         UniqueConstraint('platform', 'comment_id', name='uq_platform_comment'),
         Index('ix_sentiment_platform_posted', 'platform', 'posted_at'),
         Index('ix_sentiment_symbol_posted', 'symbol', 'posted_at'),
+        Index('ix_sentiment_plat_sym_posted', 'platform', 'symbol', posted_at.desc()),
+        # Key lookups into extra; GIN only exists on Postgres
+        Index('ix_sentiment_extra_gin', 'extra', postgresql_using='gin').ddl_if(dialect='postgresql'),
     )
 
 
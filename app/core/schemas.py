@@ -3,7 +3,7 @@ Pydantic Schemas for API Request/Response Validation
 """
 from datetime import datetime
 from typing import Optional, List, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 # ============== Platform Account ==============
@@ -19,8 +19,7 @@ class PlatformAccountResponse(BaseModel):
     last_error: Optional[str] = None
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LoginRequest(BaseModel):
@@ -61,8 +60,7 @@ class WatchTargetResponse(BaseModel):
     display_name: str
     enabled: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============== Sentiment Item ==============
@@ -80,8 +78,11 @@ class SentimentItemResponse(BaseModel):
     heat_score: Optional[float] = None
     topic: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Built at import so list validation never pays schema construction at request time
+SENTIMENT_LIST_ADAPTER = TypeAdapter(List[SentimentItemResponse])
 
 
 class SnapshotRequest(BaseModel):
@@ -117,8 +118,7 @@ class DailyJobRunResponse(BaseModel):
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============== Health ==============
@@ -3,10 +3,10 @@ Utility functions for Crystal System
 """
 from datetime import datetime, timedelta
 from typing import Optional
-import pytz
+from zoneinfo import ZoneInfo
 
 
-SHANGHAI_TZ = pytz.timezone("Asia/Shanghai")
+SHANGHAI_TZ = ZoneInfo("Asia/Shanghai")
 
 
 def get_shanghai_now() -> datetime:
@@ -36,16 +36,14 @@ def get_date_range(from_date: Optional[str], to_date: Optional[str]) -> tuple[Op
     
     if from_date:
         try:
-            start = datetime.strptime(from_date, "%Y-%m-%d")
-            start = SHANGHAI_TZ.localize(start)
+            start = datetime.strptime(from_date, "%Y-%m-%d").replace(tzinfo=SHANGHAI_TZ)
         except ValueError:
             pass
     
     if to_date:
         try:
             end = datetime.strptime(to_date, "%Y-%m-%d")
-            end = end.replace(hour=23, minute=59, second=59)
-            end = SHANGHAI_TZ.localize(end)
+            end = end.replace(hour=23, minute=59, second=59, tzinfo=SHANGHAI_TZ)
         except ValueError:
             pass
     
@@ -60,7 +58,5 @@ def format_date(dt: Optional[datetime]) -> Optional[str]:
 
 
 def truncate_text(text: str, max_length: int = 200) -> str:
-    """Truncate text to max length with ellipsis."""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - 3] + "..."
+    """Truncate text to max length with ellipsis (short text is returned as-is)."""
+    return text if len(text) <= max_length else f"{text[:max_length - 3]}..."
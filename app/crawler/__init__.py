@@ -1,6 +1,6 @@
-from .base import BaseCrawler
+from .base import BaseCrawler, CrawlerProtocol, SentimentItemRow
 from .weibo import WeiboCrawler
 from .zhihu import ZhihuCrawler
 from .xueqiu import XueqiuCrawler
 
-__all__ = ["BaseCrawler", "WeiboCrawler", "ZhihuCrawler", "XueqiuCrawler"]
+__all__ = ["BaseCrawler", "CrawlerProtocol", "SentimentItemRow", "WeiboCrawler", "ZhihuCrawler", "XueqiuCrawler"]
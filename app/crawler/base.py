@@ -1,14 +1,188 @@
 """
 Base Crawler - Abstract Base Class for All Platform Crawlers
 """
-from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import asyncio
+import html
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import (
+    List, Dict, Any, AsyncIterator, Awaitable, Callable, Deque, Iterable, Optional, Protocol,
+    Tuple, TypeVar, Union
+)
 from loguru import logger
+import httpx
 
+from app.config import settings
 
-class BaseCrawler(ABC):
-    """Abstract base class for platform crawlers."""
+
+# strptime formats tried in order when the ISO fast path does not apply
+DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%m-%d %H:%M",
+)
+
+# Page requests kept in flight ahead of the page being parsed
+PAGE_LOOKAHEAD = 4
+
+T = TypeVar("T")
+
+# Relative time markers (one regex scan instead of several `in` checks)
+_RELATIVE_TIME_RE = re.compile(r"刚刚|秒|分钟前|小时前|昨天|天前")
+_DIGITS_RE = re.compile(r"\d+")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Marker -> timedelta keyword for "N <unit> ago" strings
+_RELATIVE_UNITS = {
+    "分钟前": "minutes",
+    "小时前": "hours",
+    "天前": "days",
+}
+
+
+def _extract_int(text: str) -> int:
+    """Return the first number in text, or 1 if there is none."""
+    m = _DIGITS_RE.search(text)
+    return int(m.group()) if m else 1
+
+
+@dataclass(slots=True, frozen=True)
+class SentimentItemRow:
+    """
+    One crawled sentiment row, shaped like the sentiment_item table.
+    
+    Slotted instead of a dict so large crawl batches stay compact;
+    as_row() builds the insert mapping only when the row is written.
+    """
+    platform: str
+    target_id: Optional[int]
+    symbol: Optional[str]
+    root_post_id: Optional[str]
+    comment_id: str
+    author_id: Optional[str]
+    author_name: Optional[str]
+    content: str
+    url: Optional[str]
+    posted_at: Optional[datetime]
+    fetched_at: datetime
+    sentiment_score: Optional[float]
+    heat_score: Optional[float]
+    topic: Optional[str]
+    extra: Optional[Dict]
+    
+    def as_row(self) -> Dict[str, Any]:
+        """Column -> value mapping for an insert."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CrawlerProtocol(Protocol):
+    """What the API and scheduler need from a platform crawler."""
+    
+    async def fetch(
+        self,
+        target: Any,
+        from_date: datetime,
+        to_date: datetime
+    ) -> List[SentimentItemRow]: ...
+    
+    def iter_fetch(
+        self,
+        targets: Iterable[Any],
+        from_date: datetime,
+        to_date: datetime,
+        concurrency: int = 8,
+        return_exceptions: bool = False
+    ) -> AsyncIterator[Tuple[Any, Union[List[SentimentItemRow], Exception]]]: ...
+    
+    async def fetch_by_keyword(
+        self,
+        keyword: str,
+        from_date: datetime,
+        to_date: datetime
+    ) -> List[SentimentItemRow]: ...
+    
+    async def fetch_following_feed(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        max_pages: int = 5
+    ) -> List[SentimentItemRow]: ...
+    
+    async def aclose(self) -> None: ...
+    
+    async def __aenter__(self) -> "CrawlerProtocol": ...
+    
+    async def __aexit__(self, *exc_info) -> None: ...
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` requests per second (bursts up to `burst`).
+    
+    Callers reserve a slot under a thread lock and sleep until it comes
+    up, so one limiter can be shared across tasks, event loops and the
+    scheduler thread.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token, returning how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    async def acquire(self) -> None:
+        """Wait for a request slot."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+# Request rate limiters by platform, shared by every crawler instance
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(platform: str) -> RateLimiter:
+    """Get the platform's shared rate limiter."""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(platform)
+        if limiter is None:
+            limiter = _rate_limiters[platform] = RateLimiter(settings.CRAWL_RATE_LIMIT)
+        return limiter
+
+
+class BaseCrawler:
+    """
+    Shared helpers for platform crawlers.
+    
+    Subclasses implement fetch and fetch_by_keyword; callers are typed
+    against CrawlerProtocol.
+    """
     
     def __init__(self, cookies: Optional[Dict] = None):
         """
@@ -19,14 +193,49 @@ class BaseCrawler(ABC):
         """
         self.cookies = cookies or {}
         self.platform: str = "base"
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the crawler's HTTP client, creating it on first use.
+        
+        One client per crawler keeps connections (and HTTP/2 streams) warm
+        across targets and pages. Every request waits on the platform's
+        shared rate limiter. Use the crawler as an async context manager,
+        or call aclose() when done.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30),
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                cookies=httpx.Cookies(self.cookies),
+                event_hooks={"request": [self._throttle]}
+            )
+        return self._client
+    
+    async def _throttle(self, request: httpx.Request) -> None:
+        """Request hook: wait for a slot on the platform's rate limiter."""
+        await get_rate_limiter(self.platform).acquire()
+    
+    async def aclose(self) -> None:
+        """Close the crawler's HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self) -> "BaseCrawler":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
-    @abstractmethod
     async def fetch(
         self,
         target: Any,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch sentiment items for a target within date range.
         
@@ -36,17 +245,79 @@ class BaseCrawler(ABC):
             to_date: End of date range
             
         Returns:
-            List of sentiment item dictionaries
+            List of SentimentItemRow
         """
-        pass
+        raise NotImplementedError
+    
+    async def iter_fetch(
+        self,
+        targets: Iterable[Any],
+        from_date: datetime,
+        to_date: datetime,
+        concurrency: int = 8,
+        return_exceptions: bool = False
+    ) -> AsyncIterator[Tuple[Any, Union[List[SentimentItemRow], Exception]]]:
+        """
+        Fetch several targets concurrently, yielding (target, items) as
+        each one finishes so callers can persist and drop batches.
+        
+        With return_exceptions, a failed fetch yields (target, exception)
+        instead of ending the loop. Breaking out of the loop cancels the
+        remaining fetches.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(target: Any) -> Tuple[Any, Union[List[SentimentItemRow], Exception]]:
+            async with sem:
+                try:
+                    return target, await self.fetch(target, from_date, to_date)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    return target, e
+        
+        tasks = [asyncio.create_task(fetch_one(target)) for target in targets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _iter_pages(
+        self,
+        load: Callable[[int], Awaitable[T]],
+        max_pages: int,
+        lookahead: int = PAGE_LOOKAHEAD
+    ) -> AsyncIterator[Tuple[int, T]]:
+        """
+        Yield (page, await load(page)) for pages 1..max_pages in order,
+        keeping up to `lookahead` requests in flight.
+        
+        Breaking out of the loop (e.g. on reaching posts older than the
+        range) cancels the requests still in flight.
+        """
+        pages = iter(range(1, max_pages + 1))
+        window: Deque[Tuple[int, asyncio.Task]] = deque(
+            (page, asyncio.create_task(load(page))) for page in islice(pages, lookahead)
+        )
+        try:
+            while window:
+                page, task = window.popleft()
+                result = await task
+                for next_page in islice(pages, 1):
+                    window.append((next_page, asyncio.create_task(load(next_page))))
+                yield page, result
+        finally:
+            for _, task in window:
+                task.cancel()
     
-    @abstractmethod
     async def fetch_by_keyword(
         self,
         keyword: str,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch sentiment items by keyword search.
         
@@ -56,9 +327,9 @@ class BaseCrawler(ABC):
             to_date: End of date range
             
         Returns:
-            List of sentiment item dictionaries
+            List of SentimentItemRow
         """
-        pass
+        raise NotImplementedError
     
     def _build_item(
         self,
@@ -74,31 +345,51 @@ class BaseCrawler(ABC):
         sentiment_score: float = None,
         heat_score: float = None,
         topic: str = None,
-        extra: Dict = None
-    ) -> Dict:
+        extra: Dict = None,
+        fetched_at: datetime = None
+    ) -> SentimentItemRow:
         """
-        Build a standardized sentiment item dictionary.
+        Build a standardized sentiment item.
+        
+        Callers pass one fetched_at for a whole batch; it defaults to now.
         
         Returns:
-            Dict ready to be inserted into sentiment_item table
-        """
-        return {
-            "platform": self.platform,
-            "target_id": target_id,
-            "symbol": symbol,
-            "root_post_id": root_post_id,
-            "comment_id": comment_id,
-            "author_id": author_id,
-            "author_name": author_name,
-            "content": content,
-            "url": url,
-            "posted_at": posted_at,
-            "fetched_at": datetime.utcnow(),
-            "sentiment_score": sentiment_score,
-            "heat_score": heat_score,
-            "topic": topic,
-            "extra": extra,
-        }
+            SentimentItemRow ready to be inserted into sentiment_item table
+        """
+        return SentimentItemRow(
+            platform=self.platform,
+            target_id=target_id,
+            symbol=symbol,
+            root_post_id=root_post_id,
+            comment_id=comment_id,
+            author_id=author_id,
+            author_name=author_name,
+            content=self._clean_html(content),
+            url=url,
+            posted_at=posted_at,
+            fetched_at=fetched_at or datetime.utcnow(),
+            sentiment_score=sentiment_score,
+            heat_score=heat_score,
+            topic=topic,
+            extra=extra,
+        )
+    
+    def _clean_html(self, text: str) -> str:
+        """Strip HTML tags and decode entities (no-op for plain text)."""
+        text = self._strip_tags(text)
+        if text and "&" in text:
+            text = html.unescape(text)
+        return text
+    
+    def _strip_tags(self, text: str) -> str:
+        """
+        Strip HTML tags but keep entities, for content that is cut before
+        _build_item cleans it (decoding first would let "&lt;b&gt;" be
+        stripped as a tag on the second pass).
+        """
+        if text and "<" in text:
+            text = _HTML_TAG_RE.sub("", text)
+        return text
     
     def _parse_datetime(self, time_str: str) -> Optional[datetime]:
         """
@@ -108,19 +399,19 @@ class BaseCrawler(ABC):
         if not time_str:
             return None
         
-        # Common formats
-        formats = [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d %H:%M",
-            "%Y-%m-%d",
-            "%Y/%m/%d %H:%M:%S",
-            "%Y/%m/%d %H:%M",
-            "%m-%d %H:%M",
-        ]
+        stripped = time_str.strip()
+        
+        # Fast path: zero-padded "YYYY-MM-DD[ HH:MM[:SS]]" (or with "/"),
+        # parsed in C instead of trying strptime formats one by one
+        if len(stripped) >= 10 and stripped[4] in "-/":
+            try:
+                return datetime.fromisoformat(stripped.replace("/", "-"))
+            except ValueError:
+                pass
         
-        for fmt in formats:
+        for fmt in DATETIME_FORMATS:
             try:
-                return datetime.strptime(time_str.strip(), fmt)
+                return datetime.strptime(stripped, fmt)
             except ValueError:
                 continue
         
@@ -133,26 +424,17 @@ class BaseCrawler(ABC):
     
     def _parse_relative_time(self, time_str: str) -> Optional[datetime]:
         """Parse relative time strings like '5分钟前', '2小时前'."""
-        from datetime import timedelta
+        m = _RELATIVE_TIME_RE.search(time_str)
+        if not m:
+            return None
         
         now = datetime.now()
-        time_str = time_str.strip()
-        
-        if "刚刚" in time_str or "秒" in time_str:
+        marker = m.group()
+        if marker in ("刚刚", "秒"):
             return now
-        elif "分钟前" in time_str:
-            minutes = int("".join(filter(str.isdigit, time_str)) or 1)
-            return now - timedelta(minutes=minutes)
-        elif "小时前" in time_str:
-            hours = int("".join(filter(str.isdigit, time_str)) or 1)
-            return now - timedelta(hours=hours)
-        elif "昨天" in time_str:
+        if marker == "昨天":
             return now - timedelta(days=1)
-        elif "天前" in time_str:
-            days = int("".join(filter(str.isdigit, time_str)) or 1)
-            return now - timedelta(days=days)
-        
-        return None
+        return now - timedelta(**{_RELATIVE_UNITS[marker]: _extract_int(time_str)})
     
     def _calculate_heat_score(self, likes: int = 0, comments: int = 0, reposts: int = 0) -> float:
         """
@@ -161,15 +443,12 @@ class BaseCrawler(ABC):
         """
         return float(likes + comments * 2 + reposts * 3)
     
-    def _is_in_date_range(self, posted_at: datetime, from_date: datetime, to_date: datetime) -> bool:
-        """Check if posted_at is within date range."""
+    def _normalize_range(self, from_date: datetime, to_date: datetime) -> Tuple[datetime, datetime]:
+        """Strip timezone info from range bounds once per crawl."""
+        return from_date.replace(tzinfo=None), to_date.replace(tzinfo=None)
+    
+    def _is_in_date_range(self, posted_at: datetime, lo: datetime, hi: datetime) -> bool:
+        """Check if posted_at is within bounds from _normalize_range."""
         if posted_at is None:
             return False
-        # Remove timezone info for comparison if present
-        if posted_at.tzinfo:
-            posted_at = posted_at.replace(tzinfo=None)
-        if from_date.tzinfo:
-            from_date = from_date.replace(tzinfo=None)
-        if to_date.tzinfo:
-            to_date = to_date.replace(tzinfo=None)
-        return from_date <= posted_at <= to_date
+        return lo <= (posted_at.replace(tzinfo=None) if posted_at.tzinfo else posted_at) <= hi
@@ -0,0 +1,140 @@
+"""
+Feed Browser - Persistent Playwright Contexts for Following-Feed Scraping
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from app.account.browser_pool import CHROMIUM_ARGS
+from app.config import settings
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+
+# Longest wait for a feed's first post to render after page load (ms)
+FEED_READY_TIMEOUT = 15000
+
+class FeedBrowser:
+    """
+    Long-lived headless Chromium for the following-feed scrapers.
+    
+    Each platform gets a persistent context (profile under DATA_DIR/profiles)
+    that is launched once and keeps its cookies between crawls. Playwright is
+    bound to the loop that started it, so it restarts if the loop changes
+    (scheduled jobs run on their own loop); the previous driver is stopped
+    on its own loop.
+    """
+    
+    def __init__(self):
+        self._playwright = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._contexts: Dict[str, Any] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._start_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _ensure_started(self) -> None:
+        """Start Playwright on the running loop (restart if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._playwright is not None:
+            return
+        
+        if async_playwright is None:
+            raise ImportError("Playwright not installed")
+        
+        # Created without awaiting, so callers on one loop share one lock
+        if self._start_loop is not loop:
+            self._start_lock = asyncio.Lock()
+            self._start_loop = loop
+        
+        async with self._start_lock:
+            if self._loop is loop and self._playwright is not None:
+                return
+            
+            # Contexts left over from a previous loop are unusable here
+            self._discard()
+            self._lock = asyncio.Lock()
+            self._playwright = await async_playwright().start()
+            self._loop = loop
+    
+    def _discard(self) -> None:
+        """Detach the current driver and stop it on the loop that owns it."""
+        playwright, loop = self._playwright, self._loop
+        contexts = list(self._contexts.values())
+        self._playwright = None
+        self._loop = None
+        self._contexts = {}
+        if playwright is None:
+            return
+        
+        if not loop.is_running():
+            logger.warning("Feed browser's event loop stopped before close(); dropping its Playwright driver")
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(playwright, contexts), loop)
+    
+    @staticmethod
+    async def _shutdown(playwright: Any, contexts: List[Any]) -> None:
+        """Close contexts and stop a detached Playwright driver."""
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing feed browser context: {e}")
+        try:
+            await playwright.stop()
+        except Exception as e:
+            logger.debug(f"Error stopping Playwright: {e}")
+    
+    async def context(self, platform: str) -> Any:
+        """Get (or launch) the platform's persistent context."""
+        await self._ensure_started()
+        
+        async with self._lock:
+            context = self._contexts.get(platform)
+            if context is not None:
+                try:
+                    await context.cookies()  # Cheap liveness probe
+                except Exception as e:
+                    logger.warning(f"Feed browser for {platform} is gone, relaunching: {e}")
+                    await self.drop(platform)
+                    context = None
+            
+            if context is None:
+                profile_dir = settings.DATA_DIR / "profiles" / platform
+                profile_dir.mkdir(parents=True, exist_ok=True)
+                context = await self._playwright.chromium.launch_persistent_context(
+                    str(profile_dir),
+                    headless=settings.HEADLESS,
+                    args=CHROMIUM_ARGS
+                )
+                self._contexts[platform] = context
+                logger.info(f"Launched feed browser for {platform}")
+            return context
+    
+    async def drop(self, platform: str) -> None:
+        """Close a platform's context so the next call relaunches it."""
+        context = self._contexts.pop(platform, None)
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing feed browser for {platform}: {e}")
+    
+    async def close(self) -> None:
+        """Close all feed browsers and stop Playwright."""
+        if self._playwright is None or self._loop is not asyncio.get_running_loop():
+            return
+        
+        playwright, contexts = self._playwright, list(self._contexts.values())
+        self._playwright = None
+        self._loop = None
+        self._contexts = {}
+        await self._shutdown(playwright, contexts)
+        logger.info("Feed browser closed")
+
+
+# Global feed browser instance
+feed_browser = FeedBrowser()
@@ -2,15 +2,102 @@
 Weibo Crawler - Fetch Posts from Weibo
 """
 import asyncio
-import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import hashlib
+import os
+import re
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+from cachetools import TTLCache
 from loguru import logger
 import httpx
+import orjson
 
-from .base import BaseCrawler
+from .base import BaseCrawler, SentimentItemRow
+from .feed_browser import FEED_READY_TIMEOUT, feed_browser
 from app.config import settings
 
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+# Timeline pages requested at once
+PAGE_CONCURRENCY = 3
+
+# Page bodies younger than this are served from cache; older entries are
+# revalidated with their ETag/Last-Modified until the cache entry expires
+PAGE_CACHE_FRESH = 60  # seconds
+
+# URL -> (fetched_at monotonic, body, conditional request headers).
+# Shared by the API loop and the scheduler thread, hence the lock.
+_page_cache: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_page_cache_lock = threading.Lock()
+
+# Shared read-only defaults for .get() on API payloads (never mutated)
+_EMPTY: Dict = {}
+_EMPTY_SEQ = ()
+
+# Relative/short timestamps shown on the rendered following feed
+_FEED_HOURS_AGO_RE = re.compile(r'(\d+)小时前')
+_FEED_MINUTES_AGO_RE = re.compile(r'(\d+)分钟前')
+_FEED_HHMM_RE = re.compile(r'(\d{1,2}):(\d{2})')
+_FEED_MONTH_DAY_RE = re.compile(r'(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2})')
+
+# Action-bar lines (repost/comment/like/...) mixed into feed article text
+_FEED_UI_LINES = frozenset({'转发', '评论', '赞', '收藏', '展开', '...展开'})
+
+# Text and status link of every <article> on the feed, in one evaluate call
+_FEED_ARTICLES_JS = """() => Array.from(document.querySelectorAll('article')).map(a => {
+    const link = a.querySelector("a[href*='/detail/'], a[href*='/status/']");
+    return {text: a.innerText, href: link ? link.getAttribute('href') : ''};
+})"""
+
+# Scroll the feed to the bottom and return how many articles are loaded
+_FEED_SCROLL_JS = """() => {
+    window.scrollTo(0, document.body.scrollHeight);
+    return document.querySelectorAll('article').length;
+}"""
+
+# Resolves once more than `n` articles are loaded
+_FEED_GREW_JS = "n => document.querySelectorAll('article').length > n"
+
+# Longest wait for a scroll to load more articles (ms)
+FEED_SCROLL_WAIT = 2000
+
+_WEIBO_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_weibo_timestamp(time_str: str) -> Optional[datetime]:
+    """
+    Slice-parse "Sat Dec 07 10:30:00 +0800 2024" into naive Beijing time.
+    
+    Cached because cards on a page often share timestamps. Returns None
+    for anything that is not exactly this shape.
+    """
+    if len(time_str) != 30 or time_str[20:25] != "+0800":
+        return None
+    month = _WEIBO_MONTHS.get(time_str[4:7])
+    if month is None:
+        return None
+    try:
+        return datetime(
+            int(time_str[26:30]), month, int(time_str[8:10]),
+            int(time_str[11:13]), int(time_str[14:16]), int(time_str[17:19])
+        )
+    except ValueError:
+        return None
+
 
 class WeiboCrawler(BaseCrawler):
     """Crawler for Weibo (微博) platform."""
@@ -20,21 +107,184 @@ class WeiboCrawler(BaseCrawler):
         self.platform = "weibo"
         self.base_url = settings.WEIBO_BASE_URL
         self.api_base = "https://m.weibo.cn/api"
+        # One simdjson parser per thread (pages are parsed in worker
+        # threads), reused so the parse buffer is allocated once
+        self._sj_local = threading.local()
+    
+    def _loads(self, content: bytes) -> Any:
+        """
+        Parse an API response body.
+        
+        With pysimdjson installed this returns lazy proxies that only build
+        Python objects for the fields actually read; they stay valid until
+        the next call on the same thread, so finish with one page before
+        parsing the next. Falls back to orjson (plain dicts/lists).
+        Raises ValueError on bad JSON.
+        """
+        if simdjson is not None:
+            parser = getattr(self._sj_local, "parser", None)
+            if parser is None:
+                parser = self._sj_local.parser = simdjson.Parser()
+            return parser.parse(content)
+        return orjson.loads(content)
+    
+    async def _fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        url: str
+    ) -> Optional[bytes]:
+        """
+        Fetch one API page and return the raw body (None on HTTP error).
+        
+        Bodies are cached by URL for PAGE_CACHE_FRESH seconds, then
+        revalidated with a conditional request; a 304 reuses the body.
+        """
+        with _page_cache_lock:
+            cached = _page_cache.get(url)
+        headers = None
+        if cached is not None:
+            fetched_at, body, validators = cached
+            if time.monotonic() - fetched_at < PAGE_CACHE_FRESH:
+                return body
+            headers = validators or None
+        
+        response = await client.get(url, headers=headers, timeout=30)
+        if response.status_code == 304 and cached is not None:
+            body, validators = cached[1], cached[2]
+        elif response.status_code != 200:
+            logger.error(f"Weibo API error: {response.status_code}")
+            return None
+        else:
+            body = response.content
+            validators = {}
+            if "etag" in response.headers:
+                validators["If-None-Match"] = response.headers["etag"]
+            if "last-modified" in response.headers:
+                validators["If-Modified-Since"] = response.headers["last-modified"]
+        
+        with _page_cache_lock:
+            _page_cache[url] = (time.monotonic(), body, validators)
+        return body
+    
+    def _page_loader(
+        self,
+        client: httpx.AsyncClient,
+        url_tmpl: str
+    ) -> Callable[[int], Awaitable[Optional[bytes]]]:
+        """
+        Return load(page) for a paginated endpoint.
+        
+        At most PAGE_CONCURRENCY requests are in flight; the request rate
+        is capped by the client's platform rate limiter.
+        """
+        semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+        
+        async def load(page: int) -> Optional[bytes]:
+            async with semaphore:
+                return await self._fetch_page(client, url_tmpl.format(page))
+        
+        return load
+    
+    def _parse_timeline_page(
+        self,
+        body: bytes,
+        target: Any,
+        lo: datetime,
+        hi: datetime,
+        fetched_at: datetime
+    ) -> Tuple[List[SentimentItemRow], bool]:
+        """
+        Build items from one timeline page.
+        
+        Returns (items, reached_end); reached_end is set when the page is
+        empty or invalid, or a post older than the range was reached, so
+        no later page is needed.
+        """
+        try:
+            data = self._loads(body)
+        except ValueError:
+            logger.error(f"Weibo API returned invalid JSON for {target.display_name}")
+            return [], True
+        cards = data.get("data", _EMPTY).get("cards", _EMPTY_SEQ)
+        
+        if not cards:
+            return [], True
+        
+        # Only weibo cards carry posts
+        posts = [
+            (mblog, self._parse_weibo_time(mblog.get("created_at", "")))
+            for card in cards
+            if card.get("card_type") == 9 and (mblog := card.get("mblog"))
+        ]
+        
+        # Stop at the first post older than our range
+        reached_end = False
+        for i, (_, posted_at) in enumerate(posts):
+            if posted_at and posted_at.replace(tzinfo=None) < lo:
+                del posts[i:]
+                reached_end = True
+                break
+        
+        items = [
+            self._timeline_item(mblog, posted_at, target, fetched_at)
+            for mblog, posted_at in posts
+            if self._is_in_date_range(posted_at, lo, hi)
+        ]
+        return items, reached_end
+    
+    def _timeline_item(
+        self,
+        mblog: Dict[str, Any],
+        posted_at: Optional[datetime],
+        target: Any,
+        fetched_at: datetime
+    ) -> SentimentItemRow:
+        """Build the item for one timeline post."""
+        mid = mblog.get("id", "")
+        user = mblog.get("user") or _EMPTY
+        
+        return self._build_item(
+            comment_id=str(mid),
+            content=mblog.get("text", ""),
+            author_id=str(user.get("id", "")),
+            author_name=user.get("screen_name", ""),
+            url=f"https://m.weibo.cn/status/{mid}",
+            posted_at=posted_at,
+            symbol=target.symbol,
+            target_id=target.id,
+            heat_score=self._calculate_heat_score(
+                likes=mblog.get("attitudes_count", 0),
+                comments=mblog.get("comments_count", 0),
+                reposts=mblog.get("reposts_count", 0)
+            ),
+            extra={
+                "pics": [p.get("url") for p in mblog.get("pics", _EMPTY_SEQ)],
+                "source": mblog.get("source", ""),
+            },
+            fetched_at=fetched_at,
+        )
     
     async def fetch(
         self,
         target: Any,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch posts from a Weibo user.
         
+        Pages are requested concurrently (PAGE_CONCURRENCY at a time) and
+        parsed as they arrive; once a page reaches the end of the range,
+        requests for later pages are cancelled. Items are returned in
+        page order.
+        
         Args:
             target: WatchTarget with external_id (uid)
             from_date: Start of date range
             to_date: End of date range
         """
+        batch_fetched_at = datetime.utcnow()
+        lo, hi = self._normalize_range(from_date, to_date)
         items = []
         uid = target.external_id
         
@@ -42,81 +292,64 @@ class WeiboCrawler(BaseCrawler):
             logger.warning(f"No external_id for target: {target.display_name}")
             return items
         
+        tasks: Dict[asyncio.Task, int] = {}
         try:
-            # Use mobile API to fetch user posts
-            url = f"{self.api_base}/container/getIndex"
-            params = {
+            # Use mobile API to fetch user posts; the query string is
+            # encoded once and only the page number varies per request
+            query = urlencode({
                 "type": "uid",
                 "value": uid,
                 "containerid": f"107603{uid}",  # User timeline container
-            }
+            })
+            url_tmpl = f"{self.api_base}/container/getIndex?{query}&page={{}}"
             
-            async with httpx.AsyncClient() as client:
-                # Set cookies
-                if self.cookies:
-                    client.cookies = httpx.Cookies(self.cookies)
-                
-                page = 1
-                max_pages = 10  # Limit pages to avoid excessive requests
-                
-                while page <= max_pages:
-                    params["page"] = page
-                    response = await client.get(url, params=params, timeout=30)
-                    
-                    if response.status_code != 200:
-                        logger.error(f"Weibo API error: {response.status_code}")
-                        break
-                    
-                    data = response.json()
-                    cards = data.get("data", {}).get("cards", [])
+            client = await self._get_client()
+            
+            max_pages = 10  # Limit pages to avoid excessive requests
+            load = self._page_loader(client, url_tmpl)
+            tasks = {asyncio.create_task(load(page)): page for page in range(1, max_pages + 1)}
+            page_items: Dict[int, List[SentimentItemRow]] = {}
+            last_page = max_pages
+            pending = set(tasks)
+            
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Lowest page first: if it reaches the end of the range, the
+                # later pages that finished with it are skipped unparsed
+                for task in sorted(finished, key=tasks.__getitem__):
+                    page = tasks[task]
+                    if task.cancelled() or page > last_page:
+                        continue
                     
-                    if not cards:
-                        break
+                    if task.exception() is not None:
+                        logger.error(f"Weibo page request failed for {target.display_name}: {task.exception()}")
+                        body = None
+                    else:
+                        body = task.result()
                     
-                    for card in cards:
-                        if card.get("card_type") != 9:  # Only process weibo cards
-                            continue
-                        
-                        mblog = card.get("mblog", {})
-                        if not mblog:
-                            continue
-                        
-                        posted_at = self._parse_weibo_time(mblog.get("created_at", ""))
-                        
-                        # Check date range
-                        if posted_at and posted_at < from_date:
-                            # Reached posts older than our range, stop
-                            return items
-                        
-                        if not self._is_in_date_range(posted_at, from_date, to_date):
-                            continue
-                        
-                        item = self._build_item(
-                            comment_id=str(mblog.get("id", "")),
-                            content=mblog.get("text", ""),
-                            author_id=str(mblog.get("user", {}).get("id", "")),
-                            author_name=mblog.get("user", {}).get("screen_name", ""),
-                            url=f"https://m.weibo.cn/status/{mblog.get('id', '')}",
-                            posted_at=posted_at,
-                            symbol=target.symbol,
-                            target_id=target.id,
-                            heat_score=self._calculate_heat_score(
-                                likes=mblog.get("attitudes_count", 0),
-                                comments=mblog.get("comments_count", 0),
-                                reposts=mblog.get("reposts_count", 0)
-                            ),
-                            extra={
-                                "pics": [p.get("url") for p in mblog.get("pics", [])],
-                                "source": mblog.get("source", ""),
-                            }
+                    if body is None:
+                        reached_end = True
+                    else:
+                        # Parse off the event loop so concurrent crawls stay responsive
+                        page_items[page], reached_end = await asyncio.to_thread(
+                            self._parse_timeline_page, body, target, lo, hi, batch_fetched_at
                         )
-                        items.append(item)
-                    
-                    page += 1
-                    await asyncio.sleep(1)  # Rate limiting
                     
+                    if reached_end and page < last_page:
+                        # Later pages are past the range (or past a failure)
+                        last_page = page
+                        for other, other_page in tasks.items():
+                            if other_page > last_page:
+                                other.cancel()
+            
+            for page in range(1, last_page + 1):
+                items.extend(page_items.get(page, ()))
+        
         except Exception as e:
             logger.error(f"Error fetching Weibo posts for {target.display_name}: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
         
         logger.info(f"Weibo: fetched {len(items)} items for {target.display_name}")
         return items
@@ -126,86 +359,124 @@ class WeiboCrawler(BaseCrawler):
         keyword: str,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Search Weibo by keyword."""
+        batch_fetched_at = datetime.utcnow()
+        lo, hi = self._normalize_range(from_date, to_date)
         items = []
         
         try:
-            url = f"{self.api_base}/container/getIndex"
-            params = {
+            query = urlencode({
                 "containerid": f"100103type=1&q={keyword}",
                 "page_type": "searchall",
-            }
+            })
+            url_tmpl = f"{self.api_base}/container/getIndex?{query}&page={{}}"
             
-            async with httpx.AsyncClient() as client:
-                if self.cookies:
-                    client.cookies = httpx.Cookies(self.cookies)
-                
-                page = 1
-                max_pages = 5
+            client = await self._get_client()
+            
+            # Search pages have no date ordering to stop on, so fetch them
+            # all concurrently and walk them in order afterwards
+            max_pages = 5
+            load = self._page_loader(client, url_tmpl)
+            bodies = await asyncio.gather(
+                *(load(page) for page in range(1, max_pages + 1)),
+                return_exceptions=True
+            )
+            
+            for body in bodies:
+                if isinstance(body, BaseException):
+                    logger.error(f"Weibo search request failed for '{keyword}': {body}")
+                    break
+                if body is None:
+                    break
                 
-                while page <= max_pages:
-                    params["page"] = page
-                    response = await client.get(url, params=params, timeout=30)
-                    
-                    if response.status_code != 200:
-                        break
-                    
-                    data = response.json()
-                    cards = data.get("data", {}).get("cards", [])
-                    
-                    if not cards:
-                        break
-                    
-                    for card in cards:
-                        card_group = card.get("card_group", [])
-                        for sub_card in card_group:
-                            if sub_card.get("card_type") != 9:
-                                continue
-                            
-                            mblog = sub_card.get("mblog", {})
-                            if not mblog:
-                                continue
-                            
-                            posted_at = self._parse_weibo_time(mblog.get("created_at", ""))
-                            
-                            if not self._is_in_date_range(posted_at, from_date, to_date):
-                                continue
-                            
-                            item = self._build_item(
-                                comment_id=str(mblog.get("id", "")),
-                                content=mblog.get("text", ""),
-                                author_id=str(mblog.get("user", {}).get("id", "")),
-                                author_name=mblog.get("user", {}).get("screen_name", ""),
-                                url=f"https://m.weibo.cn/status/{mblog.get('id', '')}",
-                                posted_at=posted_at,
-                                topic=keyword,
-                                heat_score=self._calculate_heat_score(
-                                    likes=mblog.get("attitudes_count", 0),
-                                    comments=mblog.get("comments_count", 0),
-                                    reposts=mblog.get("reposts_count", 0)
-                                ),
-                            )
-                            items.append(item)
-                    
-                    page += 1
-                    await asyncio.sleep(1)
-                    
+                # Each page is parsed to plain items before the next one,
+                # since the parsed document is reused between pages
+                page_items, reached_end = self._parse_search_page(
+                    body, keyword, lo, hi, batch_fetched_at
+                )
+                items.extend(page_items)
+                if reached_end:
+                    break
+        
         except Exception as e:
             logger.error(f"Error searching Weibo for '{keyword}': {e}")
         
         return items
     
+    def _parse_search_page(
+        self,
+        body: bytes,
+        keyword: str,
+        lo: datetime,
+        hi: datetime,
+        fetched_at: datetime
+    ) -> Tuple[List[SentimentItemRow], bool]:
+        """
+        Build items from one search page.
+        
+        Returns (items, reached_end); reached_end is set when the page is
+        empty or invalid, so no later page is read.
+        """
+        try:
+            data = self._loads(body)
+        except ValueError:
+            logger.error(f"Weibo search returned invalid JSON for '{keyword}'")
+            return [], True
+        cards = data.get("data", _EMPTY).get("cards", _EMPTY_SEQ)
+        
+        if not cards:
+            return [], True
+        
+        items = []
+        for card in cards:
+            card_group = card.get("card_group", _EMPTY_SEQ)
+            for sub_card in card_group:
+                if sub_card.get("card_type") != 9:
+                    continue
+                
+                mblog = sub_card.get("mblog", _EMPTY)
+                if not mblog:
+                    continue
+                
+                posted_at = self._parse_weibo_time(mblog.get("created_at", ""))
+                
+                if not self._is_in_date_range(posted_at, lo, hi):
+                    continue
+                
+                mid = mblog.get("id", "")
+                user = mblog.get("user") or _EMPTY
+                
+                items.append(self._build_item(
+                    comment_id=str(mid),
+                    content=mblog.get("text", ""),
+                    author_id=str(user.get("id", "")),
+                    author_name=user.get("screen_name", ""),
+                    url=f"https://m.weibo.cn/status/{mid}",
+                    posted_at=posted_at,
+                    topic=keyword,
+                    heat_score=self._calculate_heat_score(
+                        likes=mblog.get("attitudes_count", 0),
+                        comments=mblog.get("comments_count", 0),
+                        reposts=mblog.get("reposts_count", 0)
+                    ),
+                    fetched_at=fetched_at,
+                ))
+        return items, False
+    
     def _parse_weibo_time(self, time_str: str) -> Optional[datetime]:
         """Parse Weibo's time format."""
         if not time_str:
             return None
         
         # Weibo uses format like "Sat Dec 07 10:30:00 +0800 2024"
+        posted_at = _parse_weibo_timestamp(time_str)
+        if posted_at is not None:
+            return posted_at
+        
         try:
-            from email.utils import parsedate_to_datetime
             return parsedate_to_datetime(time_str.replace("+0800", "GMT+0800"))
-        except:
+        except (TypeError, ValueError):
             pass
         
         # Fallback to base class parser
@@ -216,110 +487,73 @@ class WeiboCrawler(BaseCrawler):
         from_date: datetime,
         to_date: datetime,
         max_pages: int = 5
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch posts from all users the logged-in account is following.
-        Uses Playwright (sync API via executor) to render the page.
+        Renders the page with async Playwright on the feed browser's
+        persistent headless context.
         """
         if not self.cookies:
             logger.warning("No cookies for fetching Weibo following feed")
             return []
         
-        # Run sync playwright in thread pool to avoid Windows asyncio issue
-        import asyncio
-        from concurrent.futures import ThreadPoolExecutor
-        
-        loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            items = await loop.run_in_executor(
-                executor,
-                self._sync_fetch_following_feed,
-                from_date,
-                to_date,
-                max_pages
-            )
-        
-        return items
-    
-    def _sync_fetch_following_feed(
-        self,
-        from_date: datetime,
-        to_date: datetime,
-        max_pages: int
-    ) -> List[Dict]:
-        """Sync implementation of fetch_following_feed using Playwright sync API."""
+        batch_fetched_at = datetime.utcnow()
         items = []
         
         try:
-            from playwright.sync_api import sync_playwright
-            import re
-            import hashlib
+            context = await feed_browser.context(self.platform)
             
-            with sync_playwright() as p:
-                # Use visible browser so user can complete verification if needed
-                browser = p.chromium.launch(headless=False)
-                context = browser.new_context()
-                
-                # Add cookies BEFORE creating page - use domain format
+            # The persistent profile keeps cookies between runs; only add
+            # them when the account's cookies changed
+            stored = {(c["name"], c["value"]) for c in await context.cookies("https://weibo.com")}
+            wanted = {(name, str(value)) for name, value in self.cookies.items()}
+            if not wanted <= stored:
                 logger.info(f"Adding {len(self.cookies)} cookies for Weibo")
-                cookie_list = []
-                for name, value in self.cookies.items():
-                    cookie_list.append({
-                        "name": name,
-                        "value": str(value),
-                        "domain": ".weibo.com",
-                        "path": "/",
-                    })
-                context.add_cookies(cookie_list)
-                
-                page = context.new_page()
+                await context.add_cookies([
+                    {"name": name, "value": value, "domain": ".weibo.com", "path": "/"}
+                    for name, value in wanted
+                ])
+            
+            page = await context.new_page()
+            try:
                 
                 # Navigate to Weibo main site homepage
-                page.goto("https://weibo.com/", timeout=60000)
-                page.wait_for_load_state("domcontentloaded", timeout=30000)
-                page.wait_for_timeout(8000)  # Extra wait for dynamic content
-                
-                # Save debug screenshot
-                import os
-                debug_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "weibo_debug.png")
-                page.screenshot(path=debug_path)
-                logger.info(f"Saved Weibo debug screenshot to {debug_path}")
-                logger.info(f"Page title: {page.title()}")
-                logger.info(f"Page URL: {page.url}")
-                
-                # Scroll to load more content
-                for i in range(max_pages):
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(2000)
-                
-                # Log page HTML structure for debugging
-                all_divs = page.query_selector_all("div")
-                logger.info(f"Found {len(all_divs)} divs on page")
+                await page.goto("https://weibo.com/", timeout=60000)
+                await page.wait_for_load_state("domcontentloaded", timeout=30000)
+                # Wait for the first post to render rather than a fixed delay
+                try:
+                    await page.wait_for_selector("article", state="attached", timeout=FEED_READY_TIMEOUT)
+                except Exception:
+                    logger.warning("Weibo following feed rendered no articles")
                 
-                # Try multiple selectors to find feed content
-                selectors_to_try = [
-                    "div[class*='detail']",
-                    "div[class*='content']",
-                    "div[class*='text']",
-                    "div[class*='weibo']",
-                    "div[class*='card']",
-                    "article",
-                    "main div > div > div"
-                ]
+                # Scroll to load more content, stopping once a scroll brings
+                # in no new articles
+                count = await page.evaluate(_FEED_SCROLL_JS)
+                for _ in range(max_pages):
+                    try:
+                        await page.wait_for_function(_FEED_GREW_JS, arg=count, timeout=FEED_SCROLL_WAIT)
+                    except Exception:
+                        break
+                    count = await page.evaluate(_FEED_SCROLL_JS)
                 
-                for selector in selectors_to_try:
-                    elements = page.query_selector_all(selector)
-                    logger.info(f"Selector '{selector}': found {len(elements)} elements")
+                if settings.DEBUG:
+                    # Save debug screenshot (full DOM round-trips, so debug only)
+                    debug_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "weibo_debug.png")
+                    await page.screenshot(path=debug_path)
+                    logger.debug(f"Saved Weibo debug screenshot to {debug_path}")
+                    logger.debug(f"Page title: {await page.title()}, URL: {page.url}")
                 
                 # First try to get content from article elements (most reliable)
                 seen_ids = set()
-                articles = page.query_selector_all("article")
+                articles = await page.evaluate(_FEED_ARTICLES_JS)
                 logger.info(f"Found {len(articles)} article elements, extracting content...")
+                now = datetime.now()
+                yesterday = now - timedelta(days=1)
                 
                 for article in articles:
                     try:
                         # Get full article text
-                        full_text = article.inner_text() or ""
+                        full_text = article["text"] or ""
                         full_text = full_text.strip()
                         
                         if len(full_text) < 50:
@@ -335,42 +569,38 @@ class WeiboCrawler(BaseCrawler):
                         author_name = lines[0].strip() if len(lines) > 0 else ""
                         
                         # Parse the date from line 2 (e.g. "12-6 15:10" or "昨天 18:19" or "13小时前")
-                        posted_at = datetime.now()  # Default to now
+                        posted_at = now  # Default to now
                         if len(lines) > 1:
                             time_str = lines[1].strip()
                             try:
-                                import re
-                                from datetime import timedelta
-                                
                                 # Match "X小时前" format
-                                hours_match = re.match(r'(\d+)小时前', time_str)
+                                hours_match = _FEED_HOURS_AGO_RE.match(time_str)
                                 if hours_match:
                                     hours = int(hours_match.group(1))
-                                    posted_at = datetime.now() - timedelta(hours=hours)
+                                    posted_at = now - timedelta(hours=hours)
                                 # Match "X分钟前" format
                                 elif '分钟前' in time_str:
-                                    mins_match = re.match(r'(\d+)分钟前', time_str)
+                                    mins_match = _FEED_MINUTES_AGO_RE.match(time_str)
                                     if mins_match:
                                         mins = int(mins_match.group(1))
-                                        posted_at = datetime.now() - timedelta(minutes=mins)
+                                        posted_at = now - timedelta(minutes=mins)
                                 # Match "昨天 HH:MM" format
                                 elif '昨天' in time_str:
-                                    time_match = re.search(r'(\d{1,2}):(\d{2})', time_str)
+                                    time_match = _FEED_HHMM_RE.search(time_str)
                                     if time_match:
                                         hour, minute = int(time_match.group(1)), int(time_match.group(2))
-                                        yesterday = datetime.now() - timedelta(days=1)
                                         posted_at = yesterday.replace(hour=hour, minute=minute, second=0, microsecond=0)
                                     else:
-                                        posted_at = datetime.now() - timedelta(days=1)
+                                        posted_at = yesterday
                                 # Match "今天" or "刚刚"
                                 elif '今天' in time_str or '刚刚' in time_str:
-                                    posted_at = datetime.now()
+                                    posted_at = now
                                 # Match "M-D HH:MM" format (e.g. "12-7 13:20")
                                 else:
-                                    date_match = re.match(r'(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2})', time_str)
+                                    date_match = _FEED_MONTH_DAY_RE.match(time_str)
                                     if date_match:
                                         month, day, hour, minute = map(int, date_match.groups())
-                                        year = datetime.now().year
+                                        year = now.year
                                         posted_at = datetime(year, month, day, hour, minute)
                             except Exception as e:
                                 logger.debug(f"Failed to parse time: {time_str}, error: {e}")
@@ -388,7 +618,7 @@ class WeiboCrawler(BaseCrawler):
                         for line in lines[content_start:]:
                             line = line.strip()
                             # Stop at UI elements
-                            if line in ['转发', '评论', '赞', '收藏', '展开', '...展开'] or line.isdigit():
+                            if line in _FEED_UI_LINES or line.isdigit():
                                 continue
                             if len(line) > 5:
                                 content_lines.append(line)
@@ -410,9 +640,7 @@ class WeiboCrawler(BaseCrawler):
                             continue
                         seen_ids.add(content_hash)
                         
-                        # Try to find a link
-                        link_el = article.query_selector("a[href*='/detail/'], a[href*='/status/']")
-                        href = link_el.get_attribute("href") if link_el else ""
+                        href = article["href"]
                         
                         item = self._build_item(
                             comment_id=content_hash,
@@ -421,6 +649,7 @@ class WeiboCrawler(BaseCrawler):
                             url=href if href and href.startswith("http") else (f"https://weibo.com{href}" if href else ""),
                             posted_at=posted_at,
                             topic="关注动态",
+                            fetched_at=batch_fetched_at,
                         )
                         items.append(item)
                         logger.info(f"Extracted from {author_name}: {content[:50]}...")
@@ -432,11 +661,11 @@ class WeiboCrawler(BaseCrawler):
                     except Exception as e:
                         logger.debug(f"Error extracting from article: {e}")
                         continue
-                
-                browser.close()
+            
+            finally:
+                await page.close()
                 
         except Exception as e:
-            import traceback
             logger.error(f"Error fetching Weibo following feed: {e}\n{traceback.format_exc()}")
         
         logger.info(f"Weibo: fetched {len(items)} items from following feed")
@@ -1,16 +1,64 @@
 """
 Xueqiu Crawler - Fetch Stock-Related Posts from Xueqiu
 """
-import asyncio
+import hashlib
+import os
+import re
+import threading
+import traceback
+from collections import OrderedDict
+from contextlib import aclosing
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from cachetools import TTLCache
 from loguru import logger
 import httpx
+import orjson
 
-from .base import BaseCrawler
+from .base import BaseCrawler, SentimentItemRow
+from .feed_browser import FEED_READY_TIMEOUT, feed_browser
 from app.config import settings
 
 
+# Shared read-only defaults for .get() on API payloads (never mutated)
+_EMPTY: Dict = {}
+_EMPTY_SEQ = ()
+
+# Anonymous xq_a_token from the homepage, shared by crawlers whose account
+# cookies lack one (the site issues it for about a day)
+_token_cache: TTLCache = TTLCache(maxsize=1, ttl=12 * 3600)
+_token_lock = threading.Lock()
+
+# Status ids remembered per crawler to skip posts another target already
+# returned (e.g. a user's post that also shows up on a symbol timeline)
+MAX_RECENT_IDS = 50000
+
+# Following feed (home timeline) API, paged by max_id
+HOME_TIMELINE_PATH = "/v4/statuses/home_timeline.json"
+
+# Navigation/UI text that marks a rendered feed block as chrome, not a post
+# (one regex scan instead of several `in` checks)
+_FEED_UI_RE = re.compile(r"登录|注册|全部关注|自选股|条新帖|搜索")
+
+# Candidate post blocks on the rendered feed
+_FEED_BLOCK_SELECTOR = "article, div[class*='timeline'], div[class*='status'], div[class*='card']"
+
+# Text (50-2000 chars) and first status/user link of every candidate post
+# block on the feed, falling back to all divs when few blocks match
+_FEED_BLOCKS_JS = """() => {
+    let els = document.querySelectorAll("%s");
+    if (els.length < 5) els = document.querySelectorAll('div');
+    const blocks = [];
+    for (const el of els) {
+        const text = (el.innerText || '').trim();
+        if (text.length < 50 || text.length > 2000) continue;
+        const link = el.querySelector("a[href*='/status/'], a[href*='/u/']");
+        blocks.push({text, href: link ? link.getAttribute('href') : ''});
+    }
+    return blocks;
+}""" % _FEED_BLOCK_SELECTOR
+
+
 class XueqiuCrawler(BaseCrawler):
     """Crawler for Xueqiu (雪球) platform."""
     
@@ -19,13 +67,14 @@ class XueqiuCrawler(BaseCrawler):
         self.platform = "xueqiu"
         self.base_url = settings.XUEQIU_BASE_URL
         self.api_base = "https://xueqiu.com"
+        self._recent_ids: "OrderedDict[Any, None]" = OrderedDict()
     
     async def fetch(
         self,
         target: Any,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch posts based on target type.
         
@@ -48,7 +97,7 @@ class XueqiuCrawler(BaseCrawler):
         target: Any,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Fetch posts from a specific user."""
         items = []
         user_id = target.external_id
@@ -58,70 +107,17 @@ class XueqiuCrawler(BaseCrawler):
             return items
         
         try:
-            url = f"{self.api_base}/v4/statuses/user_timeline.json"
-            headers = self._get_headers()
-            params = {
-                "user_id": user_id,
-                "page": 1,
-                "count": 20,
-            }
-            
-            async with httpx.AsyncClient() as client:
-                if self.cookies:
-                    client.cookies = httpx.Cookies(self.cookies)
-                
-                page = 1
-                max_pages = 10
-                
-                while page <= max_pages:
-                    params["page"] = page
-                    response = await client.get(url, params=params, headers=headers, timeout=30)
-                    
-                    if response.status_code != 200:
-                        logger.warning(f"Xueqiu API error: {response.status_code}")
-                        break
-                    
-                    data = response.json()
-                    statuses = data.get("statuses", [])
-                    
-                    if not statuses:
-                        break
-                    
-                    for status in statuses:
-                        created_at = status.get("created_at", 0)
-                        posted_at = datetime.fromtimestamp(created_at / 1000) if created_at else None
-                        
-                        if posted_at and posted_at < from_date:
-                            return items
-                        
-                        if not self._is_in_date_range(posted_at, from_date, to_date):
-                            continue
-                        
-                        user = status.get("user", {})
-                        
-                        item = self._build_item(
-                            comment_id=str(status.get("id", "")),
-                            content=status.get("text", "") or status.get("description", ""),
-                            author_id=str(user.get("id", "")),
-                            author_name=user.get("screen_name", ""),
-                            url=f"https://xueqiu.com{status.get('target', '')}",
-                            posted_at=posted_at,
-                            symbol=target.symbol,
-                            target_id=target.id,
-                            heat_score=self._calculate_heat_score(
-                                likes=status.get("like_count", 0),
-                                comments=status.get("reply_count", 0),
-                                reposts=status.get("retweet_count", 0)
-                            ),
-                            extra={
-                                "symbols": [s.get("symbol") for s in status.get("symbols", [])],
-                            }
-                        )
-                        items.append(item)
-                    
-                    page += 1
-                    await asyncio.sleep(1)
-                    
+            items = await self._collect_statuses(
+                "/v4/statuses/user_timeline.json",
+                {"user_id": user_id, "count": 20},
+                "statuses",
+                from_date,
+                to_date,
+                max_pages=10,
+                with_symbols=True,
+                symbol=target.symbol,
+                target_id=target.id
+            )
         except Exception as e:
             logger.error(f"Error fetching Xueqiu user posts for {target.display_name}: {e}")
         
@@ -133,7 +129,7 @@ class XueqiuCrawler(BaseCrawler):
         target: Any,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Fetch posts related to a stock symbol."""
         items = []
         symbol = target.symbol
@@ -143,73 +139,17 @@ class XueqiuCrawler(BaseCrawler):
             return items
         
         try:
-            url = f"{self.api_base}/v4/statuses/stock_timeline.json"
-            headers = self._get_headers()
-            params = {
-                "symbol": symbol,
-                "count": 20,
-                "source": "all",
-            }
-            
-            async with httpx.AsyncClient() as client:
-                if self.cookies:
-                    client.cookies = httpx.Cookies(self.cookies)
-                
-                # First get xq_a_token cookie if not present
-                if "xq_a_token" not in self.cookies:
-                    await client.get(self.base_url, headers=headers)
-                
-                max_id = None
-                max_pages = 10
-                
-                for _ in range(max_pages):
-                    if max_id:
-                        params["max_id"] = max_id
-                    
-                    response = await client.get(url, params=params, headers=headers, timeout=30)
-                    
-                    if response.status_code != 200:
-                        logger.warning(f"Xueqiu API error: {response.status_code}")
-                        break
-                    
-                    data = response.json()
-                    statuses = data.get("list", [])
-                    
-                    if not statuses:
-                        break
-                    
-                    for status in statuses:
-                        created_at = status.get("created_at", 0)
-                        posted_at = datetime.fromtimestamp(created_at / 1000) if created_at else None
-                        
-                        if posted_at and posted_at < from_date:
-                            return items
-                        
-                        if not self._is_in_date_range(posted_at, from_date, to_date):
-                            continue
-                        
-                        user = status.get("user", {})
-                        
-                        item = self._build_item(
-                            comment_id=str(status.get("id", "")),
-                            content=status.get("text", "") or status.get("description", ""),
-                            author_id=str(user.get("id", "")),
-                            author_name=user.get("screen_name", ""),
-                            url=f"https://xueqiu.com{status.get('target', '')}",
-                            posted_at=posted_at,
-                            symbol=symbol,
-                            target_id=target.id,
-                            heat_score=self._calculate_heat_score(
-                                likes=status.get("like_count", 0),
-                                comments=status.get("reply_count", 0),
-                                reposts=status.get("retweet_count", 0)
-                            ),
-                        )
-                        items.append(item)
-                        max_id = status.get("id")
-                    
-                    await asyncio.sleep(1)
-                    
+            items = await self._collect_statuses(
+                "/v4/statuses/stock_timeline.json",
+                {"symbol": symbol, "count": 20, "source": "all"},
+                "list",
+                from_date,
+                to_date,
+                max_pages=10,
+                by_max_id=True,
+                symbol=symbol,
+                target_id=target.id
+            )
         except Exception as e:
             logger.error(f"Error fetching Xueqiu symbol posts for {symbol}: {e}")
         
@@ -221,247 +161,435 @@ class XueqiuCrawler(BaseCrawler):
         keyword: str,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Search Xueqiu by keyword."""
         items = []
         
         try:
-            url = f"{self.api_base}/query/v1/search/status.json"
-            headers = self._get_headers()
-            params = {
-                "q": keyword,
-                "count": 20,
-                "page": 1,
-            }
-            
-            async with httpx.AsyncClient() as client:
-                if self.cookies:
-                    client.cookies = httpx.Cookies(self.cookies)
-                
-                # Get initial cookie
-                await client.get(self.base_url, headers=headers)
-                
-                page = 1
-                max_pages = 5
-                
-                while page <= max_pages:
-                    params["page"] = page
-                    response = await client.get(url, params=params, headers=headers, timeout=30)
-                    
-                    if response.status_code != 200:
-                        break
-                    
-                    data = response.json()
-                    statuses = data.get("list", [])
-                    
-                    if not statuses:
-                        break
-                    
-                    for status in statuses:
-                        created_at = status.get("created_at", 0)
-                        posted_at = datetime.fromtimestamp(created_at / 1000) if created_at else None
-                        
-                        if not self._is_in_date_range(posted_at, from_date, to_date):
-                            continue
-                        
-                        user = status.get("user", {})
-                        
-                        item = self._build_item(
-                            comment_id=str(status.get("id", "")),
-                            content=status.get("text", "") or status.get("description", ""),
-                            author_id=str(user.get("id", "")),
-                            author_name=user.get("screen_name", ""),
-                            url=f"https://xueqiu.com{status.get('target', '')}",
-                            posted_at=posted_at,
-                            topic=keyword,
-                            heat_score=self._calculate_heat_score(
-                                likes=status.get("like_count", 0),
-                                comments=status.get("reply_count", 0),
-                                reposts=status.get("retweet_count", 0)
-                            ),
-                        )
-                        items.append(item)
-                    
-                    page += 1
-                    await asyncio.sleep(1)
-                    
+            # Search results are not in time order, so keep paging
+            items = await self._collect_statuses(
+                "/query/v1/search/status.json",
+                {"q": keyword, "count": 20},
+                "list",
+                from_date,
+                to_date,
+                max_pages=5,
+                in_order=False,
+                topic=keyword
+            )
         except Exception as e:
             logger.error(f"Error searching Xueqiu for '{keyword}': {e}")
         
         return items
     
+    async def _collect_statuses(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        list_key: str,
+        from_date: datetime,
+        to_date: datetime,
+        max_pages: int,
+        by_max_id: bool = False,
+        in_order: bool = True,
+        with_symbols: bool = False,
+        **fields: Any
+    ) -> List[SentimentItemRow]:
+        """
+        Page through a status endpoint and build items for the range.
+        
+        `list_key` names the statuses list in each response. Pages are
+        numbered, or with by_max_id continue after the previous page's last
+        status. Paging stops at the first status older than the range
+        (in_order endpoints only); `in_order`, `with_symbols` and `fields`
+        are passed to _parse_statuses. An error on a later page ends paging
+        but keeps the items already built.
+        """
+        batch_fetched_at = datetime.utcnow()
+        lo, hi = self._normalize_range(from_date, to_date)
+        items = []
+        url = f"{self.api_base}{path}"
+        headers = self._get_headers()
+        
+        client = await self._get_client()
+        if not await self._ensure_token(client, headers):
+            return items
+        
+        pages = self._status_pages(client, url, params, headers, list_key, max_pages, by_max_id)
+        try:
+            # Closing the generator on break cancels the lookahead requests
+            async with aclosing(pages):
+                async for statuses in pages:
+                    page_items, reached_end = self._parse_statuses(
+                        statuses, lo, hi, batch_fetched_at, in_order, with_symbols, **fields
+                    )
+                    items.extend(page_items)
+                    if reached_end:
+                        break
+        except Exception as e:
+            logger.error(f"Error paging Xueqiu {path}, keeping {len(items)} items: {e}")
+        
+        return items
+    
+    async def _status_pages(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Dict[str, Any],
+        headers: Dict,
+        list_key: str,
+        max_pages: int,
+        by_max_id: bool
+    ) -> AsyncIterator[Any]:
+        """
+        Yield each page's statuses until an error or an empty page.
+        
+        Numbered pages are requested a few ahead (leaving the loop cancels
+        the rest); max_id pages are sequential, each starting after the
+        last status on the previous one.
+        """
+        if by_max_id:
+            params = dict(params)
+            for _ in range(max_pages):
+                response = await client.get(url, params=params, headers=headers, timeout=30)
+                statuses = self._page_statuses(response, list_key)
+                if not statuses:
+                    return
+                yield statuses
+                params["max_id"] = statuses[-1].get("id")
+            return
+        
+        async def load(page: int) -> httpx.Response:
+            return await client.get(url, params={**params, "page": page}, headers=headers, timeout=30)
+        
+        async with aclosing(self._iter_pages(load, max_pages)) as responses:
+            async for _, response in responses:
+                statuses = self._page_statuses(response, list_key)
+                if not statuses:
+                    return
+                yield statuses
+    
+    def _page_statuses(self, response: httpx.Response, list_key: str) -> Any:
+        """Decode a page's statuses list (empty on an error response)."""
+        if response.status_code != 200:
+            logger.warning(f"Xueqiu API error: {response.status_code}")
+            return _EMPTY_SEQ
+        return orjson.loads(response.content).get(list_key, _EMPTY_SEQ)
+    
     async def fetch_following_feed(
         self,
         from_date: datetime,
         to_date: datetime,
         max_pages: int = 5
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch posts from all users the logged-in account is following.
-        Uses Playwright (sync API via executor) to render the page and bypass WAF protection.
+        Reads the home timeline API over the crawler's shared client; if
+        the API does not answer with a timeline (e.g. WAF challenge), falls
+        back to rendering the page on the feed browser's persistent context.
         
         Args:
             from_date: Start of date range
             to_date: End of date range  
-            max_pages: Maximum scrolls to perform
+            max_pages: Maximum pages (or scrolls) to fetch
         
         Returns:
-            List of sentiment item dictionaries
+            List of SentimentItemRow
         """
         if not self.cookies:
             logger.warning("No cookies for fetching following feed")
             return []
         
-        # Run sync playwright in thread pool to avoid Windows asyncio issue
-        import asyncio
-        from concurrent.futures import ThreadPoolExecutor
-        
-        loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            items = await loop.run_in_executor(
-                executor,
-                self._sync_fetch_following_feed,
-                from_date,
-                to_date,
-                max_pages
-            )
+        items = await self._fetch_home_timeline(from_date, to_date, max_pages)
+        if items is not None:
+            return items
         
-        return items
+        logger.info("Xueqiu home timeline API unavailable, rendering the feed page")
+        return await self._render_following_feed(from_date, to_date, max_pages)
     
-    def _sync_fetch_following_feed(
+    async def _fetch_home_timeline(
         self,
         from_date: datetime,
         to_date: datetime,
         max_pages: int
-    ) -> List[Dict]:
-        """Sync implementation of fetch_following_feed using Playwright sync API."""
+    ) -> Optional[List[SentimentItemRow]]:
+        """
+        Fetch the following feed from the home timeline API.
+        
+        Returns None if the first page does not come back as a timeline,
+        so the caller can fall back to the rendered page.
+        """
+        batch_fetched_at = datetime.utcnow()
+        lo, hi = self._normalize_range(from_date, to_date)
         items = []
+        answered = False  # Set once a page came back as a timeline
         
         try:
-            from playwright.sync_api import sync_playwright
-            import re
-            import hashlib
+            url = f"{self.api_base}{HOME_TIMELINE_PATH}"
+            headers = self._get_headers()
+            params = {
+                "source": "user",
+                "count": 20,
+            }
+            
+            client = await self._get_client()
             
-            with sync_playwright() as p:
-                # Use visible browser so user can complete verification if needed
-                browser = p.chromium.launch(headless=False)
-                context = browser.new_context()
+            for _ in range(max_pages):
+                response = await client.get(url, params=params, headers=headers, timeout=30)
                 
-                # Add cookies BEFORE creating page - use domain format
-                logger.info(f"Adding {len(self.cookies)} cookies for Xueqiu")
-                cookie_list = []
-                for name, value in self.cookies.items():
-                    cookie_list.append({
-                        "name": name,
-                        "value": str(value),
-                        "domain": ".xueqiu.com",
-                        "path": "/",
-                    })
-                context.add_cookies(cookie_list)
+                if response.status_code != 200:
+                    logger.warning(f"Xueqiu home timeline error: {response.status_code}")
+                    break
+                
+                data = orjson.loads(response.content)
+                statuses = data.get("home_timeline")
+                
+                if statuses is None:
+                    break
+                answered = True
+                if not statuses:
+                    break
                 
-                page = context.new_page()
+                page_items, reached_end = self._parse_statuses(
+                    statuses, lo, hi, batch_fetched_at, with_symbols=True, topic="关注动态"
+                )
+                items.extend(page_items)
+                if reached_end:
+                    break
                 
+                params["max_id"] = data.get("next_max_id") or statuses[-1].get("id")
+        
+        except Exception as e:
+            logger.error(f"Error fetching Xueqiu home timeline: {e}")
+        
+        if not answered:
+            return None
+        
+        logger.info(f"Xueqiu: fetched {len(items)} items from home timeline")
+        return items
+    
+    async def _render_following_feed(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        max_pages: int
+    ) -> List[SentimentItemRow]:
+        """Scrape the rendered following feed on the feed browser's persistent context."""
+        batch_fetched_at = datetime.utcnow()
+        items = []
+        
+        try:
+            context = await feed_browser.context(self.platform)
+            
+            # The persistent profile keeps cookies between runs; only add
+            # them when the account's cookies changed
+            stored = {(c["name"], c["value"]) for c in await context.cookies("https://xueqiu.com")}
+            wanted = {(name, str(value)) for name, value in self.cookies.items()}
+            if not wanted <= stored:
+                logger.info(f"Adding {len(self.cookies)} cookies for Xueqiu")
+                await context.add_cookies([
+                    {"name": name, "value": value, "domain": ".xueqiu.com", "path": "/"}
+                    for name, value in wanted
+                ])
+            
+            page = await context.new_page()
+            try:
                 # Navigate to homepage (cookies should already be set)
-                page.goto("https://xueqiu.com/", timeout=60000)
+                await page.goto("https://xueqiu.com/", timeout=60000)
                 # Use domcontentloaded - Xueqiu may have long-running requests
-                page.wait_for_load_state("domcontentloaded", timeout=30000)
-                page.wait_for_timeout(8000)  # Extra wait for dynamic content
+                await page.wait_for_load_state("domcontentloaded", timeout=30000)
+                # Wait for the first post block rather than a fixed delay
+                try:
+                    await page.wait_for_selector(_FEED_BLOCK_SELECTOR, state="attached", timeout=FEED_READY_TIMEOUT)
+                except Exception:
+                    logger.warning("Xueqiu following feed rendered no post blocks")
                 
-                # Save screenshot for debugging
-                import os
-                debug_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "xueqiu_debug.png")
-                page.screenshot(path=debug_path)
-                logger.info(f"Saved debug screenshot to {debug_path}")
-                
-                # Log page title and URL to check if we're on the right page
-                logger.info(f"Page title: {page.title()}")
-                logger.info(f"Page URL: {page.url}")
+                if settings.DEBUG:
+                    # Save screenshot and check we're on the right page
+                    debug_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "xueqiu_debug.png")
+                    await page.screenshot(path=debug_path)
+                    logger.debug(f"Saved debug screenshot to {debug_path}")
+                    logger.debug(f"Page title: {await page.title()}, URL: {page.url}")
                 
                 # Scroll to load more content
                 for i in range(max_pages):
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(2000)
-                
-                import re
-                import hashlib
-                
-                # Log element counts for debugging
-                logger.info(f"Looking for feed content...")
-                all_divs = page.query_selector_all("div")
-                logger.info(f"Found {len(all_divs)} divs on page")
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await page.wait_for_timeout(2000)
                 
-                # Find content blocks
+                # Candidate post blocks with their links, in one evaluate call
                 seen_ids = set()
-                all_elements = page.query_selector_all("article, div[class*='timeline'], div[class*='status'], div[class*='card']")
-                
-                if not all_elements or len(all_elements) < 5:
-                    all_elements = page.query_selector_all("div")
-                    logger.info(f"Using fallback div selector")
-                
-                logger.info(f"Processing {len(all_elements)} elements")
+                blocks = await page.evaluate(_FEED_BLOCKS_JS)
+                logger.info(f"Processing {len(blocks)} feed blocks")
+                fetched_at = datetime.now()
                 
-                for el in all_elements:
-                    try:
-                        full_text = el.inner_text() or ""
-                        full_text = full_text.strip()
-                        
-                        # Skip short or too long content
-                        if len(full_text) < 50 or len(full_text) > 2000:
-                            continue
-                        
-                        # Skip UI elements
-                        if any(x in full_text for x in ['登录', '注册', '全部关注', '自选股', '条新帖', '搜索']):
-                            continue
-                        
-                        # Generate unique ID
-                        content_hash = hashlib.md5(full_text[:100].encode()).hexdigest()[:16]
-                        
-                        if content_hash in seen_ids:
-                            continue
-                        seen_ids.add(content_hash)
-                        
-                        # Take content as-is, clean whitespace
-                        content = ' '.join(full_text.split())
-                        
-                        # Try to find link
-                        link_el = el.query_selector("a[href*='/status/'], a[href*='/u/']")
-                        href = link_el.get_attribute("href") if link_el else ""
-                        if href:
-                            if href.startswith("//"):
-                                href = f"https:{href}"
-                            elif href.startswith("/"):
-                                href = f"https://xueqiu.com{href}"
-                        
-                        # Get first line as author
-                        lines = full_text.split('\n')
-                        author_name = lines[0].strip()[:20] if lines else ""
-                        
-                        item = self._build_item(
-                            comment_id=content_hash,
-                            content=content[:500],
-                            author_name=author_name,
-                            url=href,
-                            posted_at=datetime.now(),
-                            topic="关注动态",
-                        )
-                        items.append(item)
-                        logger.info(f"Extracted: {content[:50]}...")
-                        
-                        if len(items) >= 30:
-                            break
-                            
-                    except Exception as e:
+                for block in blocks:
+                    full_text = block["text"]
+                    
+                    # Skip UI elements
+                    if _FEED_UI_RE.search(full_text):
                         continue
+                    
+                    # Generate unique ID
+                    content_hash = hashlib.md5(full_text[:100].encode()).hexdigest()[:16]
+                    
+                    if content_hash in seen_ids:
+                        continue
+                    seen_ids.add(content_hash)
+                    
+                    # Take content as-is, clean whitespace
+                    content = ' '.join(full_text.split())
+                    
+                    href = block["href"]
+                    if href:
+                        if href.startswith("//"):
+                            href = f"https:{href}"
+                        elif href.startswith("/"):
+                            href = f"https://xueqiu.com{href}"
+                    
+                    # Get first line as author
+                    lines = full_text.split('\n')
+                    author_name = lines[0].strip()[:20] if lines else ""
+                    
+                    item = self._build_item(
+                        comment_id=content_hash,
+                        content=content[:500],
+                        author_name=author_name,
+                        url=href,
+                        posted_at=fetched_at,
+                        topic="关注动态",
+                        fetched_at=batch_fetched_at,
+                    )
+                    items.append(item)
+                    logger.info(f"Extracted: {content[:50]}...")
+                    
+                    if len(items) >= 30:
+                        break
                 
-                browser.close()
+            finally:
+                await page.close()
                 
         except Exception as e:
-            import traceback
             logger.error(f"Error fetching Xueqiu following feed: {e}\n{traceback.format_exc()}")
         
         logger.info(f"Xueqiu: fetched {len(items)} items from following feed")
         return items
     
+    async def _ensure_token(self, client: httpx.AsyncClient, headers: Dict) -> bool:
+        """
+        Make sure the client carries an xq_a_token cookie.
+        
+        Uses the account's token, else a recently issued anonymous one, else
+        fetches one from the homepage. Returns False if none could be had
+        (e.g. WAF challenge), so callers can skip API calls that would fail.
+        """
+        if "xq_a_token" in client.cookies:
+            return True
+        
+        with _token_lock:
+            token = _token_cache.get("xq_a_token")
+        if token is None:
+            await client.get(self.base_url, headers=headers)
+            token = client.cookies.get("xq_a_token")
+            if token is None:
+                logger.warning("Xueqiu homepage did not issue xq_a_token, skipping API calls")
+                return False
+            with _token_lock:
+                _token_cache["xq_a_token"] = token
+        else:
+            client.cookies.set("xq_a_token", token, domain=".xueqiu.com")
+        return True
+    
+    def _parse_statuses(
+        self,
+        statuses: Any,
+        lo: datetime,
+        hi: datetime,
+        fetched_at: datetime,
+        in_order: bool = True,
+        with_symbols: bool = False,
+        **fields: Any
+    ) -> Tuple[List[SentimentItemRow], bool]:
+        """
+        Build items from one page of statuses.
+        
+        Returns (items, reached_end). For in_order (newest-first) pages,
+        reached_end is set and parsing stops at the first status older than
+        the range. `fields` (symbol, target_id, topic) are set on every
+        item; with_symbols records the tagged stock symbols in extra.
+        """
+        # Filter on raw epoch milliseconds; datetimes are only built for
+        # statuses that are kept
+        lo_ms, hi_ms = lo.timestamp() * 1000, hi.timestamp() * 1000
+        
+        # Stop at the first status older than our range
+        reached_end = False
+        if in_order:
+            for i, status in enumerate(statuses):
+                created_at = status.get("created_at")
+                if created_at and created_at < lo_ms:
+                    statuses = statuses[:i]
+                    reached_end = True
+                    break
+        
+        fromtimestamp = datetime.fromtimestamp
+        first_seen = self._first_seen
+        status_item = self._status_item
+        items = [
+            status_item(status, fromtimestamp(created_at / 1000), fetched_at, with_symbols, fields)
+            for status in statuses
+            if lo_ms <= (created_at := status.get("created_at") or 0) <= hi_ms
+            and first_seen(status.get("id"))
+        ]
+        return items, reached_end
+    
+    def _first_seen(self, status_id: Any) -> bool:
+        """
+        Record a status id; False if this crawler already returned it.
+        
+        The database keeps only the first copy of a post anyway, so later
+        copies are dropped before their items are built.
+        """
+        if not status_id:
+            return True
+        if status_id in self._recent_ids:
+            self._recent_ids.move_to_end(status_id)
+            return False
+        self._recent_ids[status_id] = None
+        if len(self._recent_ids) > MAX_RECENT_IDS:
+            self._recent_ids.popitem(last=False)
+        return True
+    
+    def _status_item(
+        self,
+        status: Dict[str, Any],
+        posted_at: Optional[datetime],
+        fetched_at: datetime,
+        with_symbols: bool,
+        fields: Dict[str, Any]
+    ) -> SentimentItemRow:
+        """Build the item for one status."""
+        get = status.get
+        user = get("user") or _EMPTY
+        
+        return self._build_item(
+            comment_id=str(get("id", "")),
+            content=get("text", "") or get("description", ""),
+            author_id=str(user.get("id", "")),
+            author_name=user.get("screen_name", ""),
+            url=f"https://xueqiu.com{get('target', '')}",
+            posted_at=posted_at,
+            heat_score=self._calculate_heat_score(
+                likes=get("like_count", 0),
+                comments=get("reply_count", 0),
+                reposts=get("retweet_count", 0)
+            ),
+            extra={
+                "symbols": [s.get("symbol") for s in get("symbols") or _EMPTY_SEQ],
+            } if with_symbols else None,
+            fetched_at=fetched_at,
+            **fields
+        )
+    
     def _get_headers(self) -> Dict:
         """Get common headers for Xueqiu requests."""
         return {
@@ -2,15 +2,26 @@
 Zhihu Crawler - Fetch Answers and Articles from Zhihu
 """
 import asyncio
+import os
+import re
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from loguru import logger
 import httpx
+import orjson
 
-from .base import BaseCrawler
+from .base import BaseCrawler, SentimentItemRow
+from .feed_browser import FEED_READY_TIMEOUT
 from app.config import settings
 
 
+# Answer/article/question links on the following feed, and their content id
+_CONTENT_LINK_SELECTOR = "a[href*='/answer/'], a[href*='/p/'], a[href*='/question/']"
+_CONTENT_LINK_RE = re.compile(r'/(?:answer|p|question)/(\d+)')
+
+
 class ZhihuCrawler(BaseCrawler):
     """Crawler for Zhihu (知乎) platform."""
     
@@ -25,7 +36,7 @@ class ZhihuCrawler(BaseCrawler):
         target: Any,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch content from a Zhihu user.
         
@@ -48,18 +59,16 @@ class ZhihuCrawler(BaseCrawler):
                 "Referer": f"https://www.zhihu.com/people/{url_token}",
             }
             
-            async with httpx.AsyncClient() as client:
-                if self.cookies:
-                    client.cookies = httpx.Cookies(self.cookies)
-                
-                # Fetch answers
-                answers = await self._fetch_answers(client, headers, url_token, from_date, to_date, target)
-                items.extend(answers)
-                
-                # Fetch articles
-                articles = await self._fetch_articles(client, headers, url_token, from_date, to_date, target)
-                items.extend(articles)
-                
+            client = await self._get_client()
+            
+            # Fetch answers
+            answers = await self._fetch_answers(client, headers, url_token, from_date, to_date, target)
+            items.extend(answers)
+            
+            # Fetch articles
+            articles = await self._fetch_articles(client, headers, url_token, from_date, to_date, target)
+            items.extend(articles)
+        
         except Exception as e:
             logger.error(f"Error fetching Zhihu content for {target.display_name}: {e}")
         
@@ -74,8 +83,10 @@ class ZhihuCrawler(BaseCrawler):
         from_date: datetime,
         to_date: datetime,
         target: Any
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Fetch user's answers."""
+        batch_fetched_at = datetime.utcnow()
+        lo, hi = self._normalize_range(from_date, to_date)
         items = []
         url = f"{self.api_base}/members/{url_token}/answers"
         params = {
@@ -97,7 +108,7 @@ class ZhihuCrawler(BaseCrawler):
                     logger.warning(f"Zhihu API error: {response.status_code}")
                     break
                 
-                data = response.json()
+                data = orjson.loads(response.content)
                 answers = data.get("data", [])
                 
                 if not answers:
@@ -107,17 +118,16 @@ class ZhihuCrawler(BaseCrawler):
                     created_time = answer.get("created_time", 0)
                     posted_at = datetime.fromtimestamp(created_time) if created_time else None
                     
-                    if posted_at and posted_at < from_date:
+                    if posted_at and posted_at < lo:
                         return items
                     
-                    if not self._is_in_date_range(posted_at, from_date, to_date):
+                    if not self._is_in_date_range(posted_at, lo, hi):
                         continue
                     
                     question = answer.get("question", {})
                     content = answer.get("content", "")
-                    # Strip HTML tags
-                    import re
-                    content = re.sub(r'<[^>]+>', '', content)
+                    # Strip HTML before truncating
+                    content = self._strip_tags(content)
                     
                     item = self._build_item(
                         comment_id=str(answer.get("id", "")),
@@ -133,6 +143,7 @@ class ZhihuCrawler(BaseCrawler):
                             comments=answer.get("comment_count", 0)
                         ),
                         topic=question.get("title", ""),
+                        fetched_at=batch_fetched_at,
                     )
                     items.append(item)
                 
@@ -140,7 +151,6 @@ class ZhihuCrawler(BaseCrawler):
                     break
                 
                 offset += 20
-                await asyncio.sleep(1)
                 
         except Exception as e:
             logger.error(f"Error fetching Zhihu answers: {e}")
@@ -155,8 +165,10 @@ class ZhihuCrawler(BaseCrawler):
         from_date: datetime,
         to_date: datetime,
         target: Any
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Fetch user's articles."""
+        batch_fetched_at = datetime.utcnow()
+        lo, hi = self._normalize_range(from_date, to_date)
         items = []
         url = f"{self.api_base}/members/{url_token}/articles"
         params = {
@@ -177,7 +189,7 @@ class ZhihuCrawler(BaseCrawler):
                 if response.status_code != 200:
                     break
                 
-                data = response.json()
+                data = orjson.loads(response.content)
                 articles = data.get("data", [])
                 
                 if not articles:
@@ -187,15 +199,14 @@ class ZhihuCrawler(BaseCrawler):
                     created_time = article.get("created", 0)
                     posted_at = datetime.fromtimestamp(created_time) if created_time else None
                     
-                    if posted_at and posted_at < from_date:
+                    if posted_at and posted_at < lo:
                         return items
                     
-                    if not self._is_in_date_range(posted_at, from_date, to_date):
+                    if not self._is_in_date_range(posted_at, lo, hi):
                         continue
                     
                     content = article.get("content", "")
-                    import re
-                    content = re.sub(r'<[^>]+>', '', content)
+                    content = self._strip_tags(content)
                     
                     item = self._build_item(
                         comment_id=f"article_{article.get('id', '')}",
@@ -211,6 +222,7 @@ class ZhihuCrawler(BaseCrawler):
                             comments=article.get("comment_count", 0)
                         ),
                         topic=article.get("title", ""),
+                        fetched_at=batch_fetched_at,
                     )
                     items.append(item)
                 
@@ -218,7 +230,6 @@ class ZhihuCrawler(BaseCrawler):
                     break
                 
                 offset += 20
-                await asyncio.sleep(1)
                 
         except Exception as e:
             logger.error(f"Error fetching Zhihu articles: {e}")
@@ -230,8 +241,10 @@ class ZhihuCrawler(BaseCrawler):
         keyword: str,
         from_date: datetime,
         to_date: datetime
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Search Zhihu by keyword."""
+        batch_fetched_at = datetime.utcnow()
+        lo, hi = self._normalize_range(from_date, to_date)
         items = []
         
         try:
@@ -247,65 +260,62 @@ class ZhihuCrawler(BaseCrawler):
                 "limit": 20,
             }
             
-            async with httpx.AsyncClient() as client:
-                if self.cookies:
-                    client.cookies = httpx.Cookies(self.cookies)
+            client = await self._get_client()
+            
+            offset = 0
+            max_offset = 60
+            
+            while offset < max_offset:
+                params["offset"] = offset
+                response = await client.get(url, params=params, headers=headers, timeout=30)
                 
-                offset = 0
-                max_offset = 60
+                if response.status_code != 200:
+                    break
                 
-                while offset < max_offset:
-                    params["offset"] = offset
-                    response = await client.get(url, params=params, headers=headers, timeout=30)
-                    
-                    if response.status_code != 200:
-                        break
-                    
-                    data = response.json()
-                    results = data.get("data", [])
+                data = orjson.loads(response.content)
+                results = data.get("data", [])
+                
+                if not results:
+                    break
+                
+                for result in results:
+                    obj = result.get("object", {})
+                    if not obj:
+                        continue
                     
-                    if not results:
-                        break
+                    obj_type = obj.get("type", "")
+                    created_time = obj.get("created_time", 0) or obj.get("created", 0)
+                    posted_at = datetime.fromtimestamp(created_time) if created_time else None
                     
-                    for result in results:
-                        obj = result.get("object", {})
-                        if not obj:
-                            continue
-                        
-                        obj_type = obj.get("type", "")
-                        created_time = obj.get("created_time", 0) or obj.get("created", 0)
-                        posted_at = datetime.fromtimestamp(created_time) if created_time else None
-                        
-                        if not self._is_in_date_range(posted_at, from_date, to_date):
-                            continue
-                        
-                        content = obj.get("content", "") or obj.get("excerpt", "")
-                        import re
-                        content = re.sub(r'<[^>]+>', '', content)
-                        
-                        author = obj.get("author", {})
-                        
-                        item = self._build_item(
-                            comment_id=f"{obj_type}_{obj.get('id', '')}",
-                            content=content[:500],
-                            author_id=author.get("url_token", ""),
-                            author_name=author.get("name", ""),
-                            url=obj.get("url", ""),
-                            posted_at=posted_at,
-                            topic=keyword,
-                            heat_score=self._calculate_heat_score(
-                                likes=obj.get("voteup_count", 0),
-                                comments=obj.get("comment_count", 0)
-                            ),
-                        )
-                        items.append(item)
+                    if not self._is_in_date_range(posted_at, lo, hi):
+                        continue
                     
-                    if data.get("paging", {}).get("is_end", True):
-                        break
+                    content = obj.get("content", "") or obj.get("excerpt", "")
+                    content = self._strip_tags(content)
                     
-                    offset += 20
-                    await asyncio.sleep(1)
+                    author = obj.get("author", {})
                     
+                    item = self._build_item(
+                        comment_id=f"{obj_type}_{obj.get('id', '')}",
+                        content=content[:500],
+                        author_id=author.get("url_token", ""),
+                        author_name=author.get("name", ""),
+                        url=obj.get("url", ""),
+                        posted_at=posted_at,
+                        topic=keyword,
+                        heat_score=self._calculate_heat_score(
+                            likes=obj.get("voteup_count", 0),
+                            comments=obj.get("comment_count", 0)
+                        ),
+                        fetched_at=batch_fetched_at,
+                    )
+                    items.append(item)
+                
+                if data.get("paging", {}).get("is_end", True):
+                    break
+                
+                offset += 20
+        
         except Exception as e:
             logger.error(f"Error searching Zhihu for '{keyword}': {e}")
         
@@ -316,7 +326,7 @@ class ZhihuCrawler(BaseCrawler):
         from_date: datetime,
         to_date: datetime,
         max_pages: int = 5
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """
         Fetch posts from all users the logged-in account is following.
         Uses Playwright (sync API via executor) to render the page.
@@ -326,9 +336,6 @@ class ZhihuCrawler(BaseCrawler):
             return []
         
         # Run sync playwright in thread pool to avoid Windows asyncio issue
-        import asyncio
-        from concurrent.futures import ThreadPoolExecutor
-        
         loop = asyncio.get_running_loop()
         with ThreadPoolExecutor(max_workers=1) as executor:
             items = await loop.run_in_executor(
@@ -346,14 +353,13 @@ class ZhihuCrawler(BaseCrawler):
         from_date: datetime,
         to_date: datetime,
         max_pages: int
-    ) -> List[Dict]:
+    ) -> List[SentimentItemRow]:
         """Sync implementation of fetch_following_feed using Playwright sync API."""
+        batch_fetched_at = datetime.utcnow()
         items = []
         
         try:
             from playwright.sync_api import sync_playwright
-            import re
-            import hashlib
             
             with sync_playwright() as p:
                 # Use visible browser so user can complete verification if needed
@@ -376,16 +382,20 @@ class ZhihuCrawler(BaseCrawler):
                 
                 # Navigate to Zhihu homepage (cookies should already be set)
                 page.goto("https://www.zhihu.com/", timeout=30000)
-                page.wait_for_load_state("networkidle", timeout=20000)
-                page.wait_for_timeout(3000)
+                # The feed keeps long-lived requests open, so wait for the
+                # first content link instead of network idle plus a delay
+                page.wait_for_load_state("domcontentloaded", timeout=20000)
+                try:
+                    page.wait_for_selector(_CONTENT_LINK_SELECTOR, state="attached", timeout=FEED_READY_TIMEOUT)
+                except Exception:
+                    logger.warning("Zhihu following feed rendered no content links")
                 
-                # Save debug screenshot
-                import os
-                debug_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "zhihu_debug.png")
-                page.screenshot(path=debug_path)
-                logger.info(f"Saved Zhihu debug screenshot to {debug_path}")
-                logger.info(f"Page title: {page.title()}")
-                logger.info(f"Page URL: {page.url}")
+                if settings.DEBUG:
+                    # Save debug screenshot
+                    debug_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "zhihu_debug.png")
+                    page.screenshot(path=debug_path)
+                    logger.debug(f"Saved Zhihu debug screenshot to {debug_path}")
+                    logger.debug(f"Page title: {page.title()}, URL: {page.url}")
                 
                 # Scroll to load more content
                 for i in range(max_pages):
@@ -393,17 +403,18 @@ class ZhihuCrawler(BaseCrawler):
                     page.wait_for_timeout(2000)
                 
                 # Find all answer/article links
-                all_links = page.query_selector_all("a[href*='/answer/'], a[href*='/p/'], a[href*='/question/']")
+                all_links = page.query_selector_all(_CONTENT_LINK_SELECTOR)
                 logger.info(f"Found {len(all_links)} content links on Zhihu page")
                 
                 seen_ids = set()
+                fetched_at = datetime.now()
                 
                 for link in all_links:
                     try:
                         href = link.get_attribute("href") or ""
                         
                         # Extract ID from href
-                        match = re.search(r'/(?:answer|p|question)/(\d+)', href)
+                        match = _CONTENT_LINK_RE.search(href)
                         if not match:
                             continue
                         
@@ -422,8 +433,9 @@ class ZhihuCrawler(BaseCrawler):
                             comment_id=content_id,
                             content=content[:1000],
                             url=href if href.startswith("http") else (f"https:{href}" if href.startswith("//") else f"https://www.zhihu.com{href}"),
-                            posted_at=datetime.now(),  # Use current time as posted time
+                            posted_at=fetched_at,  # Use fetch time as posted time
                             topic="关注动态",
+                            fetched_at=batch_fetched_at,
                         )
                         items.append(item)
                         
@@ -434,7 +446,6 @@ class ZhihuCrawler(BaseCrawler):
                 browser.close()
                 
         except Exception as e:
-            import traceback
             logger.error(f"Error fetching Zhihu following feed: {e}\n{traceback.format_exc()}")
         
         logger.info(f"Zhihu: fetched {len(items)} items from following feed")
@@ -13,8 +13,14 @@ from app.storage.database import init_db
 from app.api import public_router, auth_router
 from app.api.router_watchlist import router as watchlist_router
 from app.scheduler.runner import scheduler_runner
+from app.account.browser_pool import browser_pool
+from app.account.manager import close_health_transport
+from app.crawler.feed_browser import feed_browser
 
 
+# Data and log directories must exist before logging and the database start
+settings.ensure_dirs()
+
 # Configure loguru
 logger.remove()
 logger.add(
@@ -41,6 +47,13 @@ async def lifespan(app: FastAPI):
     
     # Start scheduler
     scheduler_runner.start()
+    
+    # Pre-launch pooled browsers so the first login skips Chromium startup
+    if settings.BROWSER_WARMUP:
+        try:
+            await browser_pool.warm_up(settings.BROWSER_WARMUP)
+        except Exception as e:
+            logger.warning(f"Browser pool warm-up failed: {e}")
     logger.info("Application ready")
     
     yield
@@ -48,6 +61,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down...")
     scheduler_runner.stop()
+    await browser_pool.close()
+    await feed_browser.close()
+    await close_health_transport()
     logger.info("Application stopped")
 
 
@@ -13,7 +13,11 @@ from app.storage.database import SessionLocal
 from app.storage.repositories import (
     AccountRepository, WatchTargetRepository, SentimentRepository, JobRepository
 )
-from app.crawler import WeiboCrawler, ZhihuCrawler, XueqiuCrawler
+from app.crawler import CrawlerProtocol, WeiboCrawler, ZhihuCrawler, XueqiuCrawler
+
+
+# Max watch targets fetched at once per platform
+TARGET_CONCURRENCY = 8
 
 
 async def run_daily_crystal_job(target_date: Optional[str] = None) -> dict:
@@ -74,6 +78,7 @@ async def run_daily_crystal_job(target_date: Optional[str] = None) -> dict:
                 cookies = account.cookies if account else {}
                 
                 # Initialize crawler
+                crawler: CrawlerProtocol
                 if platform == Platform.WEIBO:
                     crawler = WeiboCrawler(cookies)
                 elif platform == Platform.ZHIHU:
@@ -85,22 +90,24 @@ async def run_daily_crystal_job(target_date: Optional[str] = None) -> dict:
                 targets = target_repo.get_by_platform(platform_name)
                 platform_items = 0
                 
-                for target in targets:
-                    total_targets += 1
-                    logger.info(f"  Fetching: {target.display_name}")
-                    
-                    try:
-                        items = await crawler.fetch(target, from_date, to_date)
+                # Fetch targets concurrently over the crawler's shared
+                # client, saving each target's batch as it arrives
+                async with crawler:
+                    async for target, result in crawler.iter_fetch(
+                        targets, from_date, to_date, TARGET_CONCURRENCY, return_exceptions=True
+                    ):
+                        total_targets += 1
+                        
+                        if isinstance(result, Exception):
+                            logger.error(f"  {target.display_name}: Error: {result}")
+                            errors.append(f"{platform_name}/{target.display_name}: {str(result)}")
+                            continue
                         
                         # Bulk insert with deduplication
-                        if items:
-                            created = sentiment_repo.bulk_create(items)
+                        if result:
+                            created = sentiment_repo.bulk_create(result)
                             platform_items += created
-                            logger.info(f"    Created {created} items")
-                            
-                    except Exception as e:
-                        logger.error(f"    Error: {e}")
-                        errors.append(f"{platform_name}/{target.display_name}: {str(e)}")
+                            logger.info(f"  {target.display_name}: Created {created} items")
                 
                 total_items += platform_items
                 
@@ -4,19 +4,22 @@ Scheduler Runner - APScheduler Configuration
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from zoneinfo import ZoneInfo
 from loguru import logger
-import pytz
 
 from app.config import settings
 from app.scheduler.jobs import sync_run_daily_job
 
 
+SCHEDULER_TZ = ZoneInfo(settings.SCHEDULER_TIMEZONE)
+
+
 class SchedulerRunner:
     """APScheduler runner for background jobs."""
     
     def __init__(self):
         self.scheduler = BackgroundScheduler(
-            timezone=pytz.timezone(settings.SCHEDULER_TIMEZONE)
+            timezone=SCHEDULER_TZ
         )
         self._setup_jobs()
     
@@ -28,7 +31,7 @@ class SchedulerRunner:
             CronTrigger(
                 hour=settings.DAILY_JOB_HOUR,
                 minute=settings.DAILY_JOB_MINUTE,
-                timezone=pytz.timezone(settings.SCHEDULER_TIMEZONE)
+                timezone=SCHEDULER_TZ
             ),
             id="daily_crystal_job",
             name="Daily Crystal Sentiment Collection",
@@ -68,7 +71,7 @@ class SchedulerRunner:
         """Trigger a job immediately."""
         job = self.scheduler.get_job(job_id)
         if job:
-            job.modify(next_run_time=datetime.now(pytz.timezone(settings.SCHEDULER_TIMEZONE)))
+            job.modify(next_run_time=datetime.now(SCHEDULER_TZ))
             logger.info(f"Triggered job: {job_id}")
             return True
         return False
@@ -1,7 +1,7 @@
 """
 Database Connection and Session Management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 from loguru import logger
@@ -10,13 +10,33 @@ from app.config import settings
 from app.core.models import Base
 
 
-# Create engine with SQLite-specific settings
+_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+
+# Create engine with a sized connection pool shared by API requests and jobs
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLite specific
+    connect_args={"check_same_thread": False} if _is_sqlite else {},  # SQLite specific
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     echo=settings.DEBUG,
 )
 
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        WAL lets readers (API requests) proceed while a writer (crawl job)
+        holds the database, and busy_timeout waits instead of failing fast.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -43,4 +63,111 @@ def init_db() -> None:
     """
     logger.info("Initializing database...")
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _drop_stale_indexes()
+    _add_missing_indexes()
+    if _is_sqlite:
+        _ensure_sentiment_fts()
     logger.info(f"Database initialized at: {settings.DATABASE_URL}")
+
+
+def _add_missing_columns() -> None:
+    """
+    Add columns that exist on the models but not in the database.
+    create_all() only creates missing tables, so new nullable columns
+    on existing tables are added here with ALTER TABLE.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+                logger.info(f"Added column {table.name}.{column.name}")
+
+
+def _drop_stale_indexes() -> None:
+    """
+    Drop ix_* indexes that are no longer declared on the models, so
+    redundant indexes removed from the schema stop costing writes.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            declared = {index.name for index in table.indexes}
+            for index in inspector.get_indexes(table.name):
+                name = index["name"]
+                if name and name.startswith("ix_") and name not in declared:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                    logger.info(f"Dropped stale index {name}")
+
+
+def _add_missing_indexes() -> None:
+    """Create model indexes that are missing on existing tables."""
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+# Full-text index over sentiment_item (SQLite FTS5, trigram tokenizer so
+# substring search works for Chinese text without word segmentation)
+SENTIMENT_FTS_TABLE = "sentiment_item_fts"
+_sentiment_fts_ready = False
+
+
+def has_sentiment_fts() -> bool:
+    """Whether keyword search can use the FTS5 index."""
+    return _sentiment_fts_ready
+
+
+def _ensure_sentiment_fts() -> None:
+    """
+    Create the FTS5 table and sync triggers if missing, then backfill.
+    Leaves keyword search on LIKE if this SQLite build lacks FTS5/trigram.
+    """
+    global _sentiment_fts_ready
+    fts = SENTIMENT_FTS_TABLE
+    
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+                {"name": fts}
+            ).first()
+            if not exists:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                    f"content, author_name, topic, "
+                    f"content='sentiment_item', content_rowid='id', tokenize='trigram')"
+                ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON sentiment_item BEGIN "
+                    f"INSERT INTO {fts}(rowid, content, author_name, topic) "
+                    f"VALUES (new.id, new.content, new.author_name, new.topic); END"
+                ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON sentiment_item BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, content, author_name, topic) "
+                    f"VALUES ('delete', old.id, old.content, old.author_name, old.topic); END"
+                ))
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON sentiment_item BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, content, author_name, topic) "
+                    f"VALUES ('delete', old.id, old.content, old.author_name, old.topic); "
+                    f"INSERT INTO {fts}(rowid, content, author_name, topic) "
+                    f"VALUES (new.id, new.content, new.author_name, new.topic); END"
+                ))
+                # Index rows that existed before the FTS table
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+                logger.info(f"Created full-text index {fts}")
+        _sentiment_fts_ready = True
+    except Exception as e:
+        logger.warning(f"Full-text search unavailable, using LIKE for keywords: {e}")
@@ -2,15 +2,22 @@
 Data Repositories for CRUD Operations
 """
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import and_, or_, func, select, text, column, update
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.core.models import (
     PlatformAccount, WatchTarget, SentimentItem, DailyJobRun,
     LoginStatus, JobStatus
 )
 from app.config.settings import beijing_now
+from app.storage.database import SENTIMENT_FTS_TABLE, has_sentiment_fts
+
+
+# Rows per multi-VALUES insert; 16 columns keeps this well under
+# SQLite's bound-parameter limit
+BULK_INSERT_BATCH_SIZE = 500
 
 
 class AccountRepository:
@@ -23,6 +30,14 @@ class AccountRepository:
         """Get all accounts."""
         return self.db.query(PlatformAccount).all()
     
+    def status_counts(self) -> Dict[str, int]:
+        """Get number of accounts per login status."""
+        return dict(
+            self.db.query(PlatformAccount.login_status, func.count())
+            .group_by(PlatformAccount.login_status)
+            .all()
+        )
+    
     def get_by_platform(self, platform: str) -> List[PlatformAccount]:
         """Get accounts by platform."""
         return self.db.query(PlatformAccount).filter(
@@ -89,7 +104,48 @@ class AccountRepository:
             update_data["last_login_at"] = beijing_now()
         if cookies is not None:
             update_data["cookies"] = cookies
+            # New cookies invalidate any stored health check result
+            update_data["last_health_check_at"] = None
         return self.update(account_id, **update_data)
+    
+    def bulk_set_login_status(
+        self,
+        online_ids: List[int],
+        offline_ids: List[int],
+        checked: Dict[int, Tuple[bool, Optional[str]]] = None
+    ) -> None:
+        """
+        Flip many accounts online/offline and stamp health check results
+        (account ID -> (is_healthy, error)), with one UPDATE per group and
+        a single commit.
+        """
+        if not (online_ids or offline_ids or checked):
+            return
+        
+        now = beijing_now()
+        results: Dict[Tuple[bool, Optional[str]], List[int]] = {}
+        for account_id, result in (checked or {}).items():
+            results.setdefault(result, []).append(account_id)
+        for (ok, error), account_ids in results.items():
+            self.db.query(PlatformAccount).filter(
+                PlatformAccount.id.in_(account_ids)
+            ).update(
+                {"last_health_check_at": now, "last_health_ok": ok, "last_health_error": error},
+                synchronize_session=False
+            )
+        for status, account_ids in (
+            (LoginStatus.ONLINE.value, online_ids),
+            (LoginStatus.OFFLINE.value, offline_ids),
+        ):
+            if not account_ids:
+                continue
+            values = {"login_status": status, "last_error": None, "updated_at": now}
+            if status == LoginStatus.ONLINE.value:
+                values["last_login_at"] = now
+            self.db.query(PlatformAccount).filter(
+                PlatformAccount.id.in_(account_ids)
+            ).update(values, synchronize_session=False)
+        self.db.commit()
 
 
 class WatchTargetRepository:
@@ -113,6 +169,21 @@ class WatchTargetRepository:
             )
         ).all()
     
+    def list_all_rows(self) -> List[dict]:
+        """Get all targets as plain dicts ordered by platform (no ORM objects)."""
+        cols = (
+            WatchTarget.id,
+            WatchTarget.platform,
+            WatchTarget.target_type,
+            WatchTarget.external_id,
+            WatchTarget.symbol,
+            WatchTarget.keyword,
+            WatchTarget.display_name,
+            WatchTarget.enabled,
+        )
+        stmt = select(*cols).order_by(WatchTarget.platform, WatchTarget.id)
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
+    
     def get_by_id(self, target_id: int) -> Optional[WatchTarget]:
         """Get target by ID."""
         return self.db.query(WatchTarget).filter(
@@ -128,14 +199,19 @@ class WatchTargetRepository:
         return target
     
     def update(self, target_id: int, **kwargs) -> Optional[WatchTarget]:
-        """Update watch target."""
-        target = self.get_by_id(target_id)
-        if target:
-            for key, value in kwargs.items():
-                setattr(target, key, value)
-            target.updated_at = beijing_now()
-            self.db.commit()
-            self.db.refresh(target)
+        """Update watch target in one UPDATE ... RETURNING (None if missing)."""
+        stmt = (
+            update(WatchTarget)
+            .where(WatchTarget.id == target_id)
+            .values(**kwargs, updated_at=beijing_now())
+            .returning(WatchTarget)
+            .execution_options(synchronize_session=False)
+        )
+        target = self.db.execute(stmt).scalar_one_or_none()
+        if target is not None:
+            # Keep the RETURNING values instead of reloading after commit
+            self.db.expunge(target)
+        self.db.commit()
         return target
     
     def delete(self, target_id: int) -> bool:
@@ -165,7 +241,8 @@ class SentimentRepository:
         page_size: int = 50
     ) -> tuple[List[SentimentItem], int]:
         """Get sentiment items with filters and pagination."""
-        query = self.db.query(SentimentItem)
+        # Relationships must be loaded explicitly (selectinload) if needed
+        query = self.db.query(SentimentItem).options(raiseload('*'))
         
         # Apply filters
         if platform:
@@ -176,7 +253,14 @@ class SentimentRepository:
             query = query.filter(SentimentItem.posted_at >= from_date)
         if to_date:
             query = query.filter(SentimentItem.posted_at <= to_date)
-        if keyword:
+        if keyword and len(keyword) >= 3 and has_sentiment_fts():
+            # Trigram FTS needs at least 3 characters; quote as a phrase
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            matches = text(
+                f"SELECT rowid FROM {SENTIMENT_FTS_TABLE} WHERE {SENTIMENT_FTS_TABLE} MATCH :phrase"
+            ).bindparams(phrase=phrase).columns(column("rowid"))
+            query = query.filter(SentimentItem.id.in_(matches))
+        elif keyword:
             keyword_pattern = f"%{keyword}%"
             query = query.filter(
                 or_(
@@ -186,15 +270,22 @@ class SentimentRepository:
                 )
             )
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination and ordering
-        items = query.order_by(SentimentItem.posted_at.desc())\
+        # Apply pagination and ordering; the total rides along as a
+        # window column so one round-trip returns both page and count
+        rows = query.add_columns(func.count().over().label("total"))\
+            .order_by(SentimentItem.posted_at.desc())\
             .offset((page - 1) * page_size)\
             .limit(page_size)\
             .all()
         
+        if rows:
+            items = [row[0] for row in rows]
+            total = rows[0].total
+        else:
+            # Past the last page the window yields nothing; count separately
+            items = []
+            total = query.count() if page > 1 else 0
+        
         return items, total
     
     def exists(self, platform: str, comment_id: str) -> bool:
@@ -214,13 +305,31 @@ class SentimentRepository:
         self.db.refresh(item)
         return item
     
-    def bulk_create(self, items: List[dict]) -> int:
-        """Bulk create sentiment items with deduplication."""
+    def bulk_create(self, items: List) -> int:
+        """
+        Bulk create sentiment items with deduplication.
+        
+        Items are crawler rows (anything with as_row()) or plain dicts.
+        Rows go out as multi-VALUES inserts and duplicates of
+        (platform, comment_id) are skipped by the database, so there is
+        no per-row existence check.
+        """
+        if not items:
+            return 0
+        
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        
         created_count = 0
-        for item_data in items:
-            if not self.exists(item_data.get("platform"), item_data.get("comment_id")):
-                self.db.add(SentimentItem(**item_data))
-                created_count += 1
+        for start in range(0, len(items), BULK_INSERT_BATCH_SIZE):
+            rows = [
+                item if isinstance(item, dict) else item.as_row()
+                for item in items[start:start + BULK_INSERT_BATCH_SIZE]
+            ]
+            stmt = insert(SentimentItem)\
+                .values(rows)\
+                .on_conflict_do_nothing(index_elements=["platform", "comment_id"])
+            created_count += self.db.execute(stmt).rowcount
         self.db.commit()
         return created_count
 
@@ -492,8 +492,19 @@ const Timeline = () => {
 
         try {
             const response = await axios.post(`/api/v1/crawl?platform=${platform}`);
-            const result = response.data;
-            message.success(`Done! Saved ${result.total_saved} items`);
+            const { job_id } = response.data;
+
+            // Crawl runs in the background; poll until it finishes
+            let job;
+            do {
+                await new Promise((resolve) => setTimeout(resolve, 2000));
+                job = (await axios.get(`/api/v1/crawl/${job_id}`)).data;
+            } while (job.status === 'running');
+
+            if (job.status !== 'completed') {
+                throw new Error(job.error);
+            }
+            message.success(`Done! Saved ${job.result.total_saved} items`);
             fetchData();
         } catch (error) {
             message.error('Crawl failed');
@@ -10,10 +10,13 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.config import settings
 from app.scheduler.jobs import sync_run_daily_job
 
 
 def main():
+    settings.ensure_dirs()
+    
     target_date = None
     if len(sys.argv) > 1:
         target_date = sys.argv[1]